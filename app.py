@@ -1,11 +1,42 @@
 import os
+import sys
+import json
+import gzip
+import hmac
+import hashlib
+import zlib
+import marshal
+import cProfile
+import base64
+import queue
 import logging
+import sqlite3
 import threading
 import time
+import random
 import requests
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from urllib.parse import urlparse, unquote
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from functools import lru_cache
+from string import Template
+from contextvars import ContextVar, copy_context
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, stream_with_context
 from airtable import Airtable
-from collections import defaultdict
+from airtable.auth import AirtableAuth
+from collections import defaultdict, deque, OrderedDict
+from collections.abc import Mapping
+
+# Optional speedups: orjson for review payloads, brotli as a response encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -13,6 +44,8 @@ logging.basicConfig(level=logging.INFO)
 # --- Configuration ---
 AIRTABLE_API_KEY = os.environ.get('AIRTABLE_API_KEY')
 AIRTABLE_BASE_ID = os.environ.get('AIRTABLE_BASE_ID')
+# API root the clients talk to, e.g. http://127.0.0.1:8765/v0 for bench/fake_airtable.py
+AIRTABLE_API_URL = os.environ.get('AIRTABLE_API_URL', Airtable.API_URL).rstrip('/')
 
 # Table names
 TABLES = {
@@ -22,22 +55,1274 @@ TABLES = {
     'campaigns': 'campaignTable'
 }
 
+# Read cache: seconds before a cached read goes back to Airtable, per table
+CACHE_TTLS = {
+    'influencers': 300,
+    'posts': 60,
+    'errors': 120,
+    'campaigns': 600
+}
+CACHE_MAX_ENTRIES = int(os.environ.get('AIRTABLE_CACHE_MAX_ENTRIES', 512))
+
+# Shared state: set APP_STATE_PATH to a SQLite file so every worker process
+# on the host shares audit state, cache invalidations and the rate limit.
+# Workers check for other workers' invalidations at most this often
+APP_STATE_PATH = os.environ.get('APP_STATE_PATH')
+CACHE_SIGNAL_INTERVAL = 1.0
+
+# Error log index: seconds between incremental refreshes, and between full
+# rebuilds (the only way to notice deleted error rows)
+ERROR_INDEX_REFRESH_INTERVAL = 30
+ERROR_INDEX_REBUILD_INTERVAL = 3600
+
+# Summary counters: seconds between pulls of modified records, and between
+# full recounts (the only way to notice deleted posts)
+SUMMARY_REFRESH_INTERVAL = 30
+SUMMARY_REBUILD_INTERVAL = 3600
+
+# /events streams: off unless APP_EVENTS=1, since each open stream holds a
+# request worker (dashboards poll instead); seconds between checks for
+# changes made by other workers, between keepalive comments, how long one
+# stream stays open before the browser reconnects, and frames buffered per client
+EVENTS_ENABLED = os.environ.get('APP_EVENTS', '').lower() in ('1', 'true', 'yes')
+EVENTS_POLL_INTERVAL = 2
+EVENTS_KEEPALIVE = 15
+EVENTS_MAX_STREAM_SECONDS = 600
+EVENTS_QUEUE_SIZE = 100
+
+# Audit jobs: worker threads posting to the audit webhook and its timeout,
+# seconds a campaign shows as auditing after the trigger returns, and how
+# long /audit_jobs keeps finished jobs
+AUDIT_WORKERS = 2
+AUDIT_TIMEOUT = 30
+AUDIT_ACTIVE_GRACE = 10
+AUDIT_JOB_TTL = 86400
+# Audit markers left behind by a worker that died expire after this long
+AUDIT_STALE_AFTER = 3600
+
+# Mirror mode: set AIRTABLE_MIRROR_PATH to serve reads from a local SQLite copy
+AIRTABLE_MIRROR_PATH = os.environ.get('AIRTABLE_MIRROR_PATH')
+MIRROR_SYNC_INTERVAL = int(os.environ.get('AIRTABLE_MIRROR_SYNC_INTERVAL', 60))
+MIRROR_RECONCILE_INTERVAL = int(os.environ.get('AIRTABLE_MIRROR_RECONCILE_INTERVAL', 6 * 3600))
+
+# Seconds before the in-memory campaign directory reloads campaignTable
+CAMPAIGN_DIRECTORY_TTL = 600
+
+# Influencer directory: seconds between pulls of modified influencers, and
+# between full reloads (the only way to notice deleted influencers)
+INFLUENCER_DIRECTORY_REFRESH_INTERVAL = 60
+INFLUENCER_DIRECTORY_REBUILD_INTERVAL = 3600
+
+# Seconds before retrying failed warm-up steps, doubling up to the maximum;
+# the worker reports degraded until every step has succeeded
+WARMUP_RETRY_BACKOFF = 5
+WARMUP_MAX_RETRY_BACKOFF = 300
+
+# Airtable allows 5 requests per second per base; every thread shares this budget
+AIRTABLE_RATE_LIMIT = float(os.environ.get('AIRTABLE_RATE_LIMIT', 5))
+# Worker threads for fetching independent tables concurrently within a request
+FETCH_WORKERS = int(os.environ.get('AIRTABLE_FETCH_WORKERS', 4))
+
+# Shared Airtable transport: (connect, read) timeout, retries for 429/5xx and
+# connection errors, and the backoff bounds between them, in seconds
+AIRTABLE_TIMEOUT = (5, 60)
+AIRTABLE_MAX_RETRIES = int(os.environ.get('AIRTABLE_MAX_RETRIES', 3))
+AIRTABLE_BACKOFF = 1.0
+AIRTABLE_MAX_BACKOFF = 30.0
+
+# Review edits are merged per record and written in batches of up to 10
+# records (Airtable's per-request limit) this many seconds after they arrive
+WRITE_FLUSH_INTERVAL = 0.25
+WRITE_BATCH_SIZE = 10
+WRITE_TIMEOUT = 60
+
+# /get_review_data pages: ?limit= is capped at this many items per page
+REVIEW_PAGE_MAX_LIMIT = 500
+
+# /metrics histogram bucket bounds, and the query argument that splits an
+# endpoint's series (one per review type for /get_review_data)
+METRICS_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRICS_CALLS_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+METRICS_ENDPOINT_ARGS = {'get_review_data': 'type'}
+
+# Request profiling: off unless APP_PROFILE_TOKEN is set. A request sending
+# the token in an X-Profile-Token header is profiled; the last
+# PROFILE_KEEP profiles per worker are served from /profiles
+PROFILE_TOKEN = os.environ.get('APP_PROFILE_TOKEN')
+PROFILE_KEEP = int(os.environ.get('APP_PROFILE_KEEP', 20))
+PROFILE_SAMPLE_INTERVAL = 0.005
+
+# Responses of these types and at least this many bytes are gzip or brotli
+# encoded when the client accepts it; streamed NDJSON is encoded per chunk
+COMPRESS_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/html', 'text/plain'}
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI_QUALITY = 5
+
+# Keys accepted by /batch_update -> postTable fields
+REVIEW_EDIT_FIELDS = {
+    'flag': 'ManualFlag',
+    'rating': 'manualRating',
+    'reviewed': 'reviewed',
+    'status': 'approved_Status',
+    'comment': 'managerComment'
+}
+
+# Candidate post fields holding the ID the error log links to, in lookup order
+POST_ID_FIELDS = ['PostID', 'ID', 'Post_ID', 'post_id', 'postId', 'id']
+# Candidate campaign fields for a campaign's value and display name, in lookup order
+CAMPAIGN_VALUE_FIELDS = ['CampaignID', 'ID', 'Campaign_ID', 'campaign_id', 'campaignId']
+CAMPAIGN_NAME_FIELDS = ['campaignName', 'name', 'Name', 'campaign_name', 'CampaignName']
+
+# Columns each view reads, per table, sent to Airtable as fields[] so that
+# payloads (notably VideoTranscription) only carry what the view uses
+REVIEW_POST_FIELDS = ['PostLink', 'InfluencerName', 'manualRating', 'reviewFlag', 'reviewed', 'approved_Status']
+FIELD_PROJECTIONS = {
+    'summary': {
+        'posts': ['TikTokLink', 'PostQuality', 'ManualFlag']
+    },
+    'issues': {
+        'posts': POST_ID_FIELDS + REVIEW_POST_FIELDS
+    },
+    'without_issues': {
+        'posts': POST_ID_FIELDS + REVIEW_POST_FIELDS + ['PostQuality']
+    },
+    'not_uploaded': {
+        'posts': ['TikTokLink']
+    },
+    'manual_review': {
+        'posts': ['InfluencerName', 'PostLink', 'VideoTranscription', 'reviewFlag']
+    },
+    'campaign_select': {
+        'campaigns': CAMPAIGN_VALUE_FIELDS + CAMPAIGN_NAME_FIELDS
+    },
+    'influencer_directory': {
+        'influencers': ['Name', 'Active', 'TiktokLink', 'InstagramLink', 'ContactNumber']
+    },
+    'error_index': {
+        'errors': ['postId', 'errorDescription']
+    },
+    'error_stats': {
+        'posts': POST_ID_FIELDS
+    }
+}
+
+# --- Shared State ---
+class MemoryStateBackend:
+    """Shared state held in this process; enough for a single worker"""
+
+    shared = False
+
+    def __init__(self):
+        self._data = {}  # key -> (JSON value, expires_at)
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return json.loads(entry[0])
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._live(key, time.time())
+        return default if value is None else value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = (json.dumps(value), time.time() + ttl if ttl else None)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def update(self, key, fn, ttl=None):
+        """Atomically replace a value with fn(current); returning None deletes it"""
+        with self._lock:
+            now = time.time()
+            value = fn(self._live(key, now))
+            if value is None:
+                self._data.pop(key, None)
+            else:
+                self._data[key] = (json.dumps(value), now + ttl if ttl else None)
+            return value
+
+    def scan(self, prefix):
+        """All live keys starting with prefix -> value"""
+        with self._lock:
+            now = time.time()
+            keys = [key for key in self._data if key.startswith(prefix)]
+            values = {key: self._live(key, now) for key in keys}
+        return {key: value for key, value in values.items() if value is not None}
+
+class SQLiteStateBackend:
+    """Shared state in a SQLite file, visible to every worker process on the host.
+
+    Values are stored as JSON. update() runs inside BEGIN IMMEDIATE, so a
+    read-modify-write is atomic across processes.
+    """
+
+    shared = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL
+        );
+    """
+
+    PURGE_INTERVAL = 60
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+        self._connect().executescript(self.SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit; update() opens its own transactions
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _read(self, conn, key, now):
+        row = conn.execute('SELECT value, expires_at FROM state WHERE key = ?', (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return None
+        return json.loads(row[0])
+
+    def _write(self, conn, key, value, ttl, now):
+        if value is None:
+            conn.execute('DELETE FROM state WHERE key = ?', (key,))
+        else:
+            conn.execute(
+                'INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), now + ttl if ttl else None))
+
+    def get(self, key, default=None):
+        value = self._read(self._connect(), key, time.time())
+        return default if value is None else value
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        conn = self._connect()
+        self._write(conn, key, value, ttl, now)
+        if now - self._last_purge >= self.PURGE_INTERVAL:
+            self._last_purge = now
+            conn.execute('DELETE FROM state WHERE expires_at <= ?', (now,))
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM state WHERE key = ?', (key,))
+
+    def update(self, key, fn, ttl=None):
+        """Atomically replace a value with fn(current); returning None deletes it"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            value = fn(self._read(conn, key, now))
+            self._write(conn, key, value, ttl, now)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return value
+
+    def scan(self, prefix):
+        """All live keys starting with prefix -> value"""
+        rows = self._connect().execute(
+            'SELECT key, value FROM state WHERE substr(key, 1, ?) = ? '
+            'AND (expires_at IS NULL OR expires_at > ?)',
+            (len(prefix), prefix, time.time())).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+def build_state_backend(path):
+    """SQLite-backed state when a path is configured, else in-process"""
+    if path:
+        try:
+            backend = SQLiteStateBackend(path)
+            app.logger.info(f"Shared state backend: {path}")
+            return backend
+        except Exception as e:
+            app.logger.error(f"Shared state backend failed, using in-process state: {str(e)}")
+    return MemoryStateBackend()
+
+state_backend = build_state_backend(APP_STATE_PATH)
+
+# --- Airtable Read Cache ---
+class AirtableCache:
+    """Bounded LRU cache of Airtable reads with per-table TTLs"""
+
+    def __init__(self, ttls, max_entries, state=None):
+        self.ttls = ttls
+        self.max_entries = max_entries
+        # Other workers' writes arrive as per-table generation bumps
+        self.state = state if state is not None and state.shared else None
+        self._generations = {}  # table -> last generation seen
+        self._last_signal_check = 0.0
+        self._entries = OrderedDict()  # key -> (expires_at, value, {record_id: position})
+        self._lock = threading.RLock()
+        self._stats = defaultdict(int)
+
+    def lookup(self, key):
+        """Return (hit, value) for a cache key"""
+        self._check_signals()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return False, None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return True, entry[1]
+
+    def store(self, key, value):
+        """Store a single record or a list of records under key"""
+        table_name = key[1]
+        ttl = self.ttls.get(table_name, 0)
+        if ttl <= 0:
+            return
+        if isinstance(value, list):
+            positions = {rec.get('id'): i for i, rec in enumerate(value)}
+        else:
+            positions = None
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value, positions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def patch_record(self, table_name, record_id, fields):
+        """Merge written fields into every cached copy of a record"""
+        with self._lock:
+            for key, (expires_at, value, positions) in self._entries.items():
+                if key[1] != table_name:
+                    continue
+                if positions is None:
+                    if value and value.get('id') == record_id:
+                        # Replace rather than mutate so readers never see a half-applied patch
+                        self._entries[key] = (expires_at, _patched(value, fields), None)
+                        self._stats['patches'] += 1
+                elif record_id in positions:
+                    # Lists already returned to callers are never changed;
+                    # later lookups get a patched copy
+                    pos = positions[record_id]
+                    patched = list(value)
+                    patched[pos] = _patched(value[pos], fields)
+                    self._entries[key] = (expires_at, patched, positions)
+                    self._stats['patches'] += 1
+
+    def invalidate(self, table_name=None):
+        """Drop cached reads for one table, or everything"""
+        with self._lock:
+            if table_name is None:
+                self._stats['invalidations'] += len(self._entries)
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[1] == table_name]:
+                del self._entries[key]
+                self._stats['invalidations'] += 1
+
+    def signal(self, table_name):
+        """Tell other workers their cached reads of a table are stale"""
+        if self.state is None:
+            return
+        generation = self.state.update(f'cache-gen:{table_name}', lambda current: (current or 0) + 1)
+        with self._lock:
+            previous = self._generations.get(table_name)
+            self._generations[table_name] = generation
+        if previous is not None and generation != previous + 1:
+            # Another worker wrote in between; our copies may be stale too
+            self.invalidate(table_name)
+
+    def _check_signals(self):
+        if self.state is None:
+            return
+        now = time.monotonic()
+        if now - self._last_signal_check < CACHE_SIGNAL_INTERVAL:
+            return
+        self._last_signal_check = now
+        try:
+            generations = self.state.scan('cache-gen:')
+        except Exception as e:
+            app.logger.error(f"Error reading cache signals: {str(e)}")
+            return
+        for key, generation in generations.items():
+            table_name = key[len('cache-gen:'):]
+            with self._lock:
+                # A table we've never seen a signal for was at generation 0
+                previous = self._generations.get(table_name, 0)
+                self._generations[table_name] = generation
+            if previous != generation:
+                self.invalidate(table_name)
+                self._stats['remote_invalidations'] += 1
+
+    def stats(self):
+        """Hit/miss counters and current size per table"""
+        with self._lock:
+            per_table = defaultdict(int)
+            for key in self._entries:
+                per_table[key[1]] += 1
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_ratio': round(self._stats['hits'] / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'entries_per_table': dict(per_table),
+                'ttls': self.ttls,
+                'shared': self.state is not None
+            }
+
+def _patched(record, fields):
+    """Copy of record with fields merged in"""
+    return {**record, 'fields': {**record.get('fields', {}), **fields}}
+
+def _options_key(options):
+    """Hashable cache key for get_all keyword arguments"""
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in options.items()
+    ))
+
+# --- Rate Limiting & Fetch Pool ---
+class RateLimiter:
+    """Token bucket shared by every thread in the process, or by every
+    worker process when given a shared state backend"""
+
+    def __init__(self, rate, burst=None, state=None, name='airtable'):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.state = state if state is not None and state.shared else None
+        self.key = f'ratelimit:{name}'
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def pause(self, seconds):
+        """Hold back every caller for a while, e.g. after Airtable answers 429"""
+        if self.state is not None:
+            until = time.time() + seconds
+            self.state.update(self.key, lambda bucket: {
+                **(bucket or {'tokens': self.burst, 'updated': time.time()}),
+                'paused_until': max((bucket or {}).get('paused_until', 0), until)})
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _take(self):
+        """Take a token; returns 0, or the seconds to wait before trying again"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def _take_shared(self):
+        """_take against the bucket in the shared state backend (wall clock)"""
+        delay = 0
+
+        def take(bucket):
+            nonlocal delay
+            now = time.time()
+            bucket = bucket or {'tokens': self.burst, 'updated': now, 'paused_until': 0}
+            tokens = min(self.burst, bucket['tokens'] + max(0, now - bucket['updated']) * self.rate)
+            if now < bucket.get('paused_until', 0):
+                delay = bucket['paused_until'] - now
+            elif tokens >= 1:
+                tokens -= 1
+            else:
+                delay = (1 - tokens) / self.rate
+            return {**bucket, 'tokens': tokens, 'updated': now}
+
+        self.state.update(self.key, take)
+        return delay
+
+    def acquire(self):
+        """Block until a request token is available"""
+        waited = 0.0
+        while True:
+            delay = self._take_shared() if self.state is not None else self._take()
+            if delay <= 0:
+                if waited:
+                    with self._lock:
+                        self.waits += 1
+                        self.wait_seconds += waited
+                return
+            time.sleep(delay)
+            waited += delay
+
+airtable_rate_limiter = RateLimiter(AIRTABLE_RATE_LIMIT, state=state_backend)
+
+# --- Airtable Transport ---
+class AirtableUnavailable(Exception):
+    """Airtable kept throttling or failing after every retry"""
+
+TABLE_NAMES_BY_ID = {table_id: name for name, table_id in TABLES.items()}
+
+def _table_name_from_url(url):
+    """Map an Airtable API URL (/v0/<base>/<table>[/<record>]) to our table name"""
+    parts = unquote(urlparse(url).path).split('/')
+    table_id = parts[3] if len(parts) > 3 else ''
+    return TABLE_NAMES_BY_ID.get(table_id, table_id or 'unknown')
+
+class AirtableTransport(HTTPAdapter):
+    """Pooled HTTP adapter shared by every Airtable client.
+
+    Every HTTP request, including each page of a get_all, takes a token from
+    the process-wide rate limiter. 429 and 5xx responses and connection
+    errors are retried with jittered exponential backoff, honouring
+    Retry-After. A 429 also pauses the limiter so all threads back off
+    together.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, limiter, retry_limit, backoff, max_backoff, pool_size=10):
+        super().__init__(pool_connections=1, pool_maxsize=pool_size)
+        self.limiter = limiter
+        self.retry_limit = retry_limit
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._stats = defaultdict(lambda: defaultdict(int))
+        self._stats_lock = threading.Lock()
+
+    def _count(self, table_name, counter):
+        with self._stats_lock:
+            self._stats[table_name][counter] += 1
+
+    def _delay(self, attempt, response=None):
+        """Retry-After if Airtable sent one, else full-jitter exponential backoff"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def send(self, request, **kwargs):
+        table_name = _table_name_from_url(request.url)
+        for attempt in range(self.retry_limit + 1):
+            self.limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                record_airtable(table_name, seconds=time.perf_counter() - started)
+                if attempt == self.retry_limit:
+                    self._count(table_name, 'failures')
+                    raise AirtableUnavailable(f"Airtable unreachable ({table_name}): {str(e)}") from e
+                self._count(table_name, 'retries')
+                record_airtable(table_name, retries=1)
+                time.sleep(self._delay(attempt))
+                continue
+
+            self._count(table_name, 'requests')
+            record_airtable(table_name, requests=1, bytes=len(response.content),
+                            seconds=time.perf_counter() - started)
+            if response.status_code not in self.RETRY_STATUSES:
+                return response
+            if response.status_code == 429:
+                self._count(table_name, 'throttles')
+            if attempt == self.retry_limit:
+                self._count(table_name, 'failures')
+                raise AirtableUnavailable(
+                    f"Airtable returned {response.status_code} for {table_name} "
+                    f"after {self.retry_limit} retries")
+
+            delay = self._delay(attempt, response)
+            if response.status_code == 429:
+                self.limiter.pause(delay)
+            response.close()
+            self._count(table_name, 'retries')
+            record_airtable(table_name, retries=1)
+            app.logger.warning(
+                f"Airtable {response.status_code} on {table_name}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def stats(self):
+        with self._stats_lock:
+            per_table = {name: dict(counters) for name, counters in self._stats.items()}
+        totals = defaultdict(int)
+        for counters in per_table.values():
+            for counter, value in counters.items():
+                totals[counter] += value
+        return {
+            **totals,
+            'tables': per_table,
+            'rate_limit_waits': self.limiter.waits,
+            'rate_limit_wait_seconds': round(self.limiter.wait_seconds, 3)
+        }
+
+airtable_transport = AirtableTransport(
+    airtable_rate_limiter, AIRTABLE_MAX_RETRIES, AIRTABLE_BACKOFF, AIRTABLE_MAX_BACKOFF,
+    pool_size=FETCH_WORKERS + 8)
+
+def build_airtable_session(api_key):
+    """One keep-alive session, mounted on the shared transport, for all tables"""
+    session = requests.Session()
+    session.auth = AirtableAuth(api_key=api_key)
+    session.mount('https://', airtable_transport)
+    session.mount('http://', airtable_transport)
+    return session
+
+fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='airtable-fetch')
+
+def fetch_parallel(loaders):
+    """Run independent {name: callable} loaders on the fetch pool.
+
+    Returns {name: result}; a loader's exception is re-raised here. Each task
+    runs in a copy of the caller's context so Airtable calls are still
+    counted against the current request.
+    """
+    futures = {name: fetch_executor.submit(copy_context().run, loader)
+               for name, loader in loaders.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+# --- Airtable Call Accounting ---
+class RequestAirtableStats:
+    """Airtable work done on behalf of one Flask request, per table.
+
+    calls are table operations (get, get_all, update, ...); requests are the
+    HTTP requests they turned into, one per page, and seconds is the time
+    spent in them. Cache hits and misses are reads of the shared cache.
+    """
+
+    COUNTERS = ('calls', 'requests', 'retries', 'records', 'bytes', 'seconds', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.tables = defaultdict(lambda: dict.fromkeys(self.COUNTERS, 0))
+        self._lock = threading.Lock()
+
+    def add(self, table_name, **counters):
+        # Fetch pool threads share the request's stats
+        with self._lock:
+            table = self.tables[table_name]
+            for counter, value in counters.items():
+                table[counter] += value
+
+    def per_table(self):
+        with self._lock:
+            return {name: dict(counters) for name, counters in self.tables.items()}
+
+    def totals(self):
+        totals = dict.fromkeys(self.COUNTERS, 0)
+        for counters in self.per_table().values():
+            for counter, value in counters.items():
+                totals[counter] += value
+        return totals
+
+# Set up in before_request; None outside requests (warm-up, syncers, write queue)
+_request_airtable_stats = ContextVar('request_airtable_stats', default=None)
+endpoint_airtable_calls = defaultdict(lambda: {'requests': 0, 'airtable_calls': 0, 'tables': defaultdict(int)})
+_endpoint_calls_lock = threading.Lock()
+
+def record_airtable(table_name, **counters):
+    """Add to the current request's Airtable counters, if any"""
+    stats = _request_airtable_stats.get()
+    if stats is not None:
+        stats.add(table_name, **counters)
+
+def count_airtable_call(table_name):
+    """Record one Airtable API call against the current request, if any"""
+    record_airtable(table_name, calls=1)
+
+class CachedTable:
+    """Read-through cache in front of an Airtable client.
+
+    Reads are served from the shared cache until their table TTL expires;
+    writes go straight to Airtable and patch the cached copies so reviewers
+    see their own edits immediately.
+    """
+
+    def __init__(self, name, client, cache):
+        self.name = name
+        self.client = client
+        self.cache = cache
+
+    def get(self, record_id):
+        key = ('record', self.name, record_id)
+        hit, record = self.cache.lookup(key)
+        if hit:
+            record_airtable(self.name, cache_hits=1)
+            return record
+        record_airtable(self.name, cache_misses=1)
+        count_airtable_call(self.name)
+        record = self.client.get(record_id)
+        record_airtable(self.name, records=1)
+        self.cache.store(key, record)
+        return record
+
+    def get_all(self, cache=True, **options):
+        """get_all through the cache; cache=False for one-off queries"""
+        if not cache:
+            count_airtable_call(self.name)
+            records = self.client.get_all(**options)
+            record_airtable(self.name, records=len(records))
+            return records
+        key = ('list', self.name, _options_key(options))
+        hit, records = self.cache.lookup(key)
+        if hit:
+            record_airtable(self.name, cache_hits=1)
+            return records
+        record_airtable(self.name, cache_misses=1)
+        count_airtable_call(self.name)
+        records = self.client.get_all(**options)
+        record_airtable(self.name, records=len(records))
+        self.cache.store(key, records)
+        return records
+
+    def update(self, record_id, fields, typecast=False):
+        count_airtable_call(self.name)
+        record = self.client.update(record_id, fields, typecast=typecast)
+        self._written(record_id, fields)
+        self.cache.signal(self.name)
+        return record
+
+    def batch_update(self, records, typecast=False):
+        count_airtable_call(self.name)
+        updated = self.client.batch_update(records, typecast=typecast)
+        for rec in records:
+            self._written(rec['id'], rec['fields'])
+        self.cache.signal(self.name)
+        return updated
+
+    def _written(self, record_id, fields):
+        self.cache.patch_record(self.name, record_id, fields)
+        if airtable_mirror is not None:
+            airtable_mirror.patch(self.name, record_id, fields)
+        if self.name == 'influencers':
+            influencer_directory.record_written(record_id, fields)
+        summary_counters.record_written(self.name, record_id, fields)
+
+    def insert(self, fields, typecast=False):
+        count_airtable_call(self.name)
+        record = self.client.insert(fields, typecast=typecast)
+        self.cache.invalidate(self.name)
+        self.cache.signal(self.name)
+        return record
+
+    def delete(self, record_id):
+        count_airtable_call(self.name)
+        result = self.client.delete(record_id)
+        self.cache.invalidate(self.name)
+        self.cache.signal(self.name)
+        return result
+
+    def __getattr__(self, attr):
+        return getattr(self.client, attr)
+
+# --- Metrics ---
+def _metric_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _metric_labels(labels):
+    """{a="x",b="y"} from ((name, value), ...) pairs"""
+    if not labels:
+        return ''
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}'
+
+class MetricsRegistry:
+    """Prometheus counters and histograms kept in process memory.
+
+    Each worker process serves its own series on /metrics; Prometheus sums
+    them across scrape targets.
+    """
+
+    def __init__(self):
+        self._metrics = OrderedDict()  # name -> (type, help, buckets, {labels: value})
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text):
+        self._metrics[name] = ('counter', help_text, None, {})
+
+    def histogram(self, name, help_text, buckets):
+        self._metrics[name] = ('histogram', help_text, tuple(buckets), {})
+
+    def inc(self, name, labels, value=1):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._metrics[name][3]
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            _, _, buckets, series = self._metrics[name]
+            observed = series.get(key)
+            if observed is None:
+                observed = series[key] = {'buckets': [0] * len(buckets), 'sum': 0, 'count': 0}
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    observed['buckets'][i] += 1
+            observed['sum'] += value
+            observed['count'] += 1
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets, series) in self._metrics.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for key, value in series.items():
+                    if kind == 'counter':
+                        lines.append(f'{name}{_metric_labels(key)} {_metric_number(value)}')
+                        continue
+                    for bound, count in zip(buckets, value['buckets']):
+                        lines.append(f'{name}_bucket{_metric_labels(key + (("le", _metric_number(bound)),))} {count}')
+                    lines.append(f'{name}_bucket{_metric_labels(key + (("le", "+Inf"),))} {value["count"]}')
+                    lines.append(f'{name}_sum{_metric_labels(key)} {_metric_number(value["sum"])}')
+                    lines.append(f'{name}_count{_metric_labels(key)} {value["count"]}')
+        return '\n'.join(lines) + '\n'
+
+# RequestAirtableStats counter -> per endpoint and table Prometheus counter
+AIRTABLE_METRICS = {
+    'calls': ('airtable_calls_total', 'Airtable table operations (get, get_all, update, ...)'),
+    'requests': ('airtable_http_requests_total', 'Airtable HTTP requests, one per page'),
+    'retries': ('airtable_retries_total', 'Airtable HTTP requests retried after a 429, 5xx or connection error'),
+    'records': ('airtable_records_total', 'Records returned by Airtable reads'),
+    'bytes': ('airtable_response_bytes_total', 'Response body bytes received from Airtable'),
+    'seconds': ('airtable_seconds_total', 'Seconds spent in Airtable HTTP requests'),
+    'cache_hits': ('airtable_cache_hits_total', 'Airtable reads served from the read cache'),
+    'cache_misses': ('airtable_cache_misses_total', 'Airtable reads that missed the read cache')
+}
+
+metrics = MetricsRegistry()
+metrics.counter('app_requests_total', 'Flask requests by endpoint and status code')
+metrics.histogram('app_request_duration_seconds', 'Time to build each response', METRICS_SECONDS_BUCKETS)
+metrics.histogram('airtable_calls_per_request', 'Airtable table operations per request', METRICS_CALLS_BUCKETS)
+metrics.histogram('airtable_seconds_per_request', 'Seconds spent in Airtable per request', METRICS_SECONDS_BUCKETS)
+for _name, _help in AIRTABLE_METRICS.values():
+    metrics.counter(_name, _help)
+
+# --- Local SQLite Mirror ---
+class AirtableMirror:
+    """Local SQLite copy of the Airtable base, kept current by a background syncer.
+
+    Each sync pulls only records modified since the table's last watermark;
+    watermarks live in the database file, so a restarted process resumes
+    incrementally instead of re-downloading everything. A periodic full
+    reconcile removes records deleted in Airtable.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS records (
+            table_name TEXT NOT NULL,
+            id TEXT NOT NULL,
+            created_time TEXT,
+            fields TEXT NOT NULL,
+            campaign_id TEXT,
+            quality TEXT,
+            active TEXT,  -- unused, kept so mirrors created before stay readable
+            synced_at REAL NOT NULL,
+            PRIMARY KEY (table_name, id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_records_campaign ON records (table_name, campaign_id, quality);
+        DROP INDEX IF EXISTS idx_records_active;
+        CREATE INDEX IF NOT EXISTS idx_records_synced ON records (table_name, synced_at);
+        CREATE TABLE IF NOT EXISTS sync_state (
+            table_name TEXT PRIMARY KEY,
+            watermark TEXT,
+            last_reconcile REAL
+        );
+    """
+
+    # Indexed column -> Airtable field, per table
+    INDEXED_FIELDS = {
+        'posts': {'campaign_id': 'CampaignId', 'quality': 'PostQuality'}
+    }
+
+    OVERLAP_SECONDS = 60
+
+    def __init__(self, path, sync_interval, reconcile_interval):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.reconcile_interval = reconcile_interval
+        self.last_sync = {}
+        self.last_error = None
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # Sync
+    def start(self):
+        """Start the background syncer thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='airtable-mirror', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self.sync_all()
+            time.sleep(self.sync_interval)
+
+    def sync_all(self):
+        # Cleared once per pass so a later table's success can't hide an earlier failure
+        self.last_error = None
+        for table_name in TABLES:
+            try:
+                self.sync_table(table_name)
+            except Exception as e:
+                self.last_error = f"{table_name}: {str(e)}"
+                app.logger.error(f"Mirror sync failed for {table_name}: {str(e)}")
+
+    def sync_table(self, table_name):
+        """Pull records modified since the last watermark into the mirror"""
+        with self._sync_lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT watermark, last_reconcile FROM sync_state WHERE table_name = ?',
+                (table_name,)).fetchone()
+            watermark, last_reconcile = row if row else (None, None)
+            reconcile = not watermark or not last_reconcile or time.time() - last_reconcile >= self.reconcile_interval
+
+            started = time.time()
+            if reconcile:
+                records = tables[table_name].get_all(cache=False)
+            else:
+                records = tables[table_name].get_all(cache=False, formula=str(modified_after(watermark)))
+
+            with conn:
+                # Stamp rows at write time so synced_since() readers see them
+                self._upsert(conn, table_name, records, time.time())
+                if reconcile:
+                    conn.execute(
+                        'DELETE FROM records WHERE table_name = ? AND synced_at < ?',
+                        (table_name, started))
+                conn.execute(
+                    'INSERT OR REPLACE INTO sync_state (table_name, watermark, last_reconcile) VALUES (?, ?, ?)',
+                    (table_name,
+                     time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(started - self.OVERLAP_SECONDS)),
+                     started if reconcile else last_reconcile))
+            self.last_sync[table_name] = {
+                'at': started,
+                'records': len(records),
+                'reconciled': reconcile,
+                'seconds': round(time.time() - started, 3)
+            }
+
+    def _upsert(self, conn, table_name, records, synced_at):
+        indexed = self.INDEXED_FIELDS.get(table_name, {})
+        conn.executemany(
+            'INSERT OR REPLACE INTO records '
+            '(table_name, id, created_time, fields, campaign_id, quality, synced_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(table_name, rec['id'], rec.get('createdTime'), json.dumps(rec.get('fields', {})),
+              *(_formula_text(rec.get('fields', {}).get(indexed[col])) if col in indexed else None
+                for col in ('campaign_id', 'quality')),
+              synced_at)
+             for rec in records])
+
+    def patch(self, table_name, record_id, fields):
+        """Write-through for edits made by this app"""
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT id, created_time, fields FROM records WHERE table_name = ? AND id = ?',
+            (table_name, record_id)).fetchone()
+        if not row:
+            return
+        record = _patched(self._record(row), fields)
+        with conn:
+            self._upsert(conn, table_name, [record], time.time())
+
+    @property
+    def ready(self):
+        """True once every table has completed at least one sync"""
+        row = self._connect().execute(
+            'SELECT COUNT(*) FROM sync_state WHERE watermark IS NOT NULL').fetchone()
+        return row[0] >= len(TABLES)
+
+    # Reads
+    @staticmethod
+    def _record(row):
+        return {'id': row[0], 'createdTime': row[1], 'fields': json.loads(row[2])}
+
+    def _select(self, where, params):
+        rows = self._connect().execute(
+            f'SELECT id, created_time, fields FROM records WHERE {where} ORDER BY created_time, id',
+            params).fetchall()
+        return [self._record(row) for row in rows]
+
+    def get(self, table_name, record_id):
+        records = self._select('table_name = ? AND id = ?', (table_name, record_id))
+        return records[0] if records else None
+
+    def all(self, table_name):
+        return self._select('table_name = ?', (table_name,))
+
+    def synced_since(self, table_name, since):
+        """Records written into the mirror after a local timestamp"""
+        return self._select('table_name = ? AND synced_at > ?', (table_name, since))
+
+    def campaign_posts(self, campaign_value, where=None):
+        """A campaign's posts (every post without a value), optionally only
+        those matching a Formula; its indexed predicates run in SQLite so
+        rows it rules out are never decoded"""
+        clauses, params = ["table_name = 'posts'"], []
+        if campaign_value:
+            clauses.append('campaign_id = ?')
+            params.append(_formula_text(campaign_value))
+        columns = {field: column for column, field in self.INDEXED_FIELDS['posts'].items()}
+        narrowed = where.sql(columns) if where else None
+        if narrowed:
+            clauses.append(f'({narrowed[0]})')
+            params.extend(narrowed[1])
+        posts = self._select(' AND '.join(clauses), tuple(params))
+        return [post for post in posts if where.matches(post['fields'])] if where else posts
+
+    def stats(self):
+        conn = self._connect()
+        counts = dict(conn.execute(
+            'SELECT table_name, COUNT(*) FROM records GROUP BY table_name').fetchall())
+        watermarks = dict(conn.execute('SELECT table_name, watermark FROM sync_state').fetchall())
+        return {
+            'path': self.path,
+            'ready': self.ready,
+            'records': counts,
+            'watermarks': watermarks,
+            'last_sync': self.last_sync,
+            'last_error': self.last_error
+        }
+
+def _formula_text(value):
+    """Render a field value the way an Airtable formula compares it as text"""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return ', '.join(_formula_text(v) or '' for v in value)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+# --- Formula Builder ---
+class Formula:
+    """A filterByFormula expression paired with the same test in Python.
+
+    Build them with the helpers below rather than f-strings so values are
+    escaped. str() gives the formula for Airtable; matches() applies it to
+    records read from the mirror or the cache, and sql() narrows a mirror
+    query with the indexed columns it can use. Combine with & and |.
+    """
+
+    def __init__(self, text, test=None, sql=None):
+        self.text = text
+        self._test = test
+        self._sql = sql
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f'Formula({self.text!r})'
+
+    def __and__(self, other):
+        return all_of(self, other)
+
+    def __or__(self, other):
+        return any_of(self, other)
+
+    def matches(self, fields):
+        if self._test is None:
+            raise TypeError(f"{self.text} can only be evaluated by Airtable")
+        return self._test(fields)
+
+    def sql(self, columns):
+        """(clause, params) over the indexed columns ({field: column}) that
+        every matching record satisfies, or None if they can't narrow it.
+        Rows it selects still need matches()."""
+        return self._sql(columns) if self._sql else None
+
+def formula_field(name):
+    return '{' + name + '}'
+
+def formula_string(value):
+    """A value as a quoted, escaped formula string literal"""
+    text = _formula_text(value) or ''
+    return "'" + text.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def field_equals(name, value, trim=False):
+    """{name} = value, compared as text; trim ignores surrounding whitespace in the field"""
+    target = _formula_text(value) or ''
+
+    def sql(columns):
+        column = columns.get(name)
+        if column is None:
+            return None
+        if trim:
+            return f"TRIM({column}, ' \t\r\n') = ?", (target,)
+        return f"{column} = ?", (target,)
+
+    if trim:
+        return Formula(f"TRIM({formula_field(name)})={formula_string(target)}",
+                       lambda fields: (_formula_text(fields.get(name)) or '').strip() == target, sql)
+    return Formula(f"{formula_field(name)}={formula_string(target)}",
+                   lambda fields: (_formula_text(fields.get(name)) or '') == target, sql)
+
+def field_not_blank(name):
+    """{name} has something other than whitespace in it"""
+    return Formula(f"TRIM({formula_field(name)})!=''",
+                   lambda fields: bool((_formula_text(fields.get(name)) or '').strip()))
+
+def all_of(*formulas):
+    formulas = [f for f in formulas if f is not None]
+    if len(formulas) == 1:
+        return formulas[0]
+    tests = [f._test for f in formulas]
+
+    def sql(columns):
+        # Any part that narrows the query narrows the conjunction
+        clauses = [clause for clause in (f.sql(columns) for f in formulas) if clause]
+        if not clauses:
+            return None
+        return (' AND '.join(f'({text})' for text, _ in clauses),
+                tuple(param for _, params in clauses for param in params))
+
+    return Formula(f"AND({', '.join(f.text for f in formulas)})",
+                   None if None in tests else lambda fields: all(test(fields) for test in tests), sql)
+
+def any_of(*formulas):
+    if len(formulas) == 1:
+        return formulas[0]
+    tests = [f._test for f in formulas]
+
+    def sql(columns):
+        # Every alternative has to narrow, or the disjunction can't
+        clauses = [f.sql(columns) for f in formulas]
+        if not all(clauses):
+            return None
+        return (' OR '.join(f'({text})' for text, _ in clauses),
+                tuple(param for _, params in clauses for param in params))
+
+    return Formula(f"OR({', '.join(f.text for f in formulas)})",
+                   None if None in tests else lambda fields: any(test(fields) for test in tests), sql)
+
+def modified_after(timestamp):
+    """Records Airtable last modified after an ISO timestamp; only Airtable can evaluate it"""
+    return Formula(f"IS_AFTER(LAST_MODIFIED_TIME(), {formula_string(timestamp)})")
+
+def campaign_filter(campaign_value):
+    """Posts of one campaign, or None for every campaign"""
+    return field_equals('CampaignId', campaign_value) if campaign_value else None
+
+# Posts each view keeps, pushed down to Airtable; views without an entry
+# read every post of the campaign (issues matches them against the error index)
+POST_FILTERS = {
+    'without_issues': field_equals('PostQuality', 'All Correct', trim=True) & field_not_blank('PostLink'),
+    'not_uploaded': field_not_blank('TikTokLink'),
+    'manual_review': field_equals('PostQuality', 'Manual Review')
+}
+ACTIVE_INFLUENCER_FILTER = field_equals('Active', 'YES')
+
+def merge_post_filters(views):
+    """Posts any of the views keeps, or None if one of them needs every post"""
+    if not views or any(view not in POST_FILTERS for view in views):
+        return None
+    return any_of(*(POST_FILTERS[view] for view in dict.fromkeys(views)))
+
+def get_mirror():
+    """The local mirror if mirror mode is on and it has finished its first sync"""
+    if airtable_mirror is not None and airtable_mirror.ready:
+        return airtable_mirror
+    return None
+
 # --- Initialize Airtable Connections ---
-app.logger.info("Initializing Airtable connections...")
-tables = {}
-active_campaigns = {}
+class AirtableTables(Mapping):
+    """Table name -> CachedTable, each client built on first use.
+
+    Nothing here touches the network, so importing the app is instant; the
+    warm-up thread makes the first Airtable calls. Membership and truthiness
+    follow the configured tables, so `if not tables` and `name in tables`
+    checks behave as they did with a plain dict.
+    """
+
+    def __init__(self, names, cache):
+        self._names = tuple(names)
+        self._cache = cache
+        self._tables = {}
+        self._session = None
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        table = self._tables.get(name)
+        if table is not None:
+            return table
+        if name not in self._names:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._tables:
+                if self._session is None:
+                    self._session = build_airtable_session(AIRTABLE_API_KEY)
+                client = Airtable(AIRTABLE_BASE_ID, TABLES[name], AIRTABLE_API_KEY, timeout=AIRTABLE_TIMEOUT)
+                client.session = self._session
+                client.url_table = AIRTABLE_API_URL + client.url_table[len(Airtable.API_URL):]
+                # Pagination is paced by the shared rate limiter, not a fixed sleep per page
+                client.API_LIMIT = 0
+                self._tables[name] = CachedTable(name, client, self._cache)
+            return self._tables[name]
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+airtable_cache = AirtableCache(CACHE_TTLS, CACHE_MAX_ENTRIES, state_backend)
+airtable_mirror = None
 
 if AIRTABLE_API_KEY and AIRTABLE_BASE_ID:
-    try:
-        for name, table_id in TABLES.items():
-            tables[name] = Airtable(AIRTABLE_BASE_ID, table_id, AIRTABLE_API_KEY)
-
-        # Test connection
-        tables['influencers'].get_all(max_records=1)
-        app.logger.info("Airtable connection successful")
-    except Exception as e:
-        app.logger.error(f"Airtable connection failed: {str(e)}")
+    tables = AirtableTables(TABLES, airtable_cache)
+
+    if AIRTABLE_MIRROR_PATH:
+        try:
+            airtable_mirror = AirtableMirror(
+                AIRTABLE_MIRROR_PATH, MIRROR_SYNC_INTERVAL, MIRROR_RECONCILE_INTERVAL)
+            airtable_mirror.start()
+            app.logger.info(f"Mirror mode enabled: {AIRTABLE_MIRROR_PATH}")
+        except Exception as e:
+            app.logger.error(f"Mirror initialization failed: {str(e)}")
+            airtable_mirror = None
 else:
+    tables = AirtableTables((), airtable_cache)
     app.logger.error("Missing AIRTABLE_API_KEY or AIRTABLE_BASE_ID in environment")
 
 # --- Helper Functions ---
@@ -46,20 +1331,20 @@ def get_record(table_name, record_id, default=None):
     if not record_id or table_name not in tables:
         return default
     try:
+        mirror = get_mirror()
+        if mirror:
+            record = mirror.get(table_name, record_id)
+            if record:
+                return record
         return tables[table_name].get(record_id)
     except Exception:
         return default
 
 def get_influencer_name(influencer_id):
     """Get influencer name by ID"""
-    record = get_record('influencers', influencer_id)
+    record = influencer_directory.get(influencer_id)
     return record['fields'].get('Name', 'Unknown Influencer') if record else 'Unknown Influencer'
 
-def get_campaign_details(campaign_id):
-    """Get campaign details by ID"""
-    record = get_record('campaigns', campaign_id)
-    return record['fields'] if record else None
-
 def ensure_list(value):
     """Ensure the value is a list"""
     if value is None:
@@ -68,12 +1353,12 @@ def ensure_list(value):
 
 def get_campaign_value(campaign_record_id):
     """Get campaign value from record ID"""
-    campaign = get_record('campaigns', campaign_record_id)
+    campaign = campaign_directory.get(campaign_record_id)
     if not campaign:
         return campaign_record_id
 
     fields = campaign.get('fields', {})
-    for field_name in ['CampaignID', 'ID', 'Campaign_ID', 'campaign_id', 'campaignId']:
+    for field_name in CAMPAIGN_VALUE_FIELDS:
         if field_name in fields:
             value = fields[field_name]
             return str(value) if isinstance(value, (int, float)) else value
@@ -96,22 +1381,9 @@ def get_campaign_name_from_value(campaign_value):
         return "No Campaign Selected"
 
     try:
-        # Search for campaign by value in different fields
-        for field_name in ['CampaignID', 'ID', 'Campaign_ID', 'campaign_id', 'campaignId']:
-            formula = f"{{{field_name}}}='{campaign_value}'"
-            try:
-                campaigns = tables['campaigns'].get_all(formula=formula)
-                if campaigns:
-                    campaign = campaigns[0]  # Get the first match
-                    fields = campaign.get('fields', {})
-                    for name_field in ['campaignName', 'name', 'Name', 'campaign_name', 'CampaignName']:
-                        if name_field in fields and fields[name_field]:
-                            return fields[name_field]
-            except Exception:
-                continue
-
-        # If not found by formula, return the value
-        return f"Campaign {campaign_value}"
+        campaign = campaign_directory.get_by_value(campaign_value)
+        name = _campaign_name(campaign.get('fields', {})) if campaign else None
+        return name or f"Campaign {campaign_value}"
 
     except Exception as e:
         app.logger.error(f"Error getting campaign name from value {campaign_value}: {str(e)}")
@@ -152,30 +1424,25 @@ def get_campaign_name(campaign_id):
         return "No Campaign Selected"
 
     try:
-        # Try to get the campaign record
-        campaign_record = get_record('campaigns', campaign_id)
-
-        if campaign_record and 'fields' in campaign_record:
-            # Try different possible field names for campaign name
-            fields = campaign_record['fields']
-            for field_name in ['campaignName', 'name', 'Name', 'campaign_name', 'CampaignName']:
-                if field_name in fields and fields[field_name]:
-                    return fields[field_name]
+        campaign_record = campaign_directory.get(campaign_id)
+        name = _campaign_name(campaign_record.get('fields', {})) if campaign_record else None
 
         # If no campaign name found, return the ID
-        return f"Campaign {campaign_id}"
+        return name or f"Campaign {campaign_id}"
 
     except Exception as e:
         app.logger.error(f"Error getting campaign name for ID {campaign_id}: {str(e)}")
         return f"Campaign {campaign_id}"
 
 # --- Data Processing Functions ---
-def parse_error_description(error_desc):
-    """Parse error description and extract unique hashtags and tags"""
+@lru_cache(maxsize=4096)
+def parse_error_facts(error_desc):
+    """(missing hashtags, missing tags) as frozensets; memoized on the text,
+    since the audit writes the same few descriptions over and over"""
     missing_hashtags = set()
     missing_tags = set()
 
-    for part in error_desc.split("Partially Correct/Incorrect"):
+    for part in (error_desc or '').split("Partially Correct/Incorrect"):
         if not part.strip():
             continue
 
@@ -188,99 +1455,1388 @@ def parse_error_description(error_desc):
                 tags = [t.strip() for t in error_part.replace("Missing Tags:", "").split(",") if t.strip()]
                 missing_tags.update(tags)
 
+    return frozenset(missing_hashtags), frozenset(missing_tags)
+
+def parse_error_description(error_desc):
+    """Parse error description and extract unique hashtags and tags"""
+    missing_hashtags, missing_tags = parse_error_facts(error_desc)
     return list(missing_hashtags), list(missing_tags)
 
+# Suggested WhatsApp messages, one template per scenario. A line that is
+# exactly $issues expands to one line per issue (or none)
+MESSAGE_TEMPLATES = {
+    'issues': (
+        "Hi $first_name,",
+        "We noticed issues with your recent post for $campaign_name:",
+        "$issues",
+        "View it here: $post_link",
+        "Please review and update.",
+        "Thanks!"
+    ),
+    'approved': (
+        "Hi $first_name,",
+        "Great job on your recent post for $campaign_name!",
+        "View it here: $post_link",
+        "Your content looks perfect and meets all requirements.",
+        "Thank you for your excellent work!",
+        "Keep it up!"
+    ),
+    'takedown': (
+        "Hi $first_name,",
+        "We are issuing a takedown notice for your recent post for $campaign_name:",
+        "$issues",
+        "View it here: $post_link",
+        "Please take it down promptly.",
+        "Thanks!"
+    ),
+    'video_ok': (
+        "Hi $first_name,",
+        "We are confirming that your recent post for $campaign_name is approved:",
+        "View it here: $post_link",
+        "It can remain online.",
+        "Thanks!"
+    ),
+    'not_uploaded': (
+        "Hi $first_name,",
+        "We noticed you haven't uploaded your video for $campaign_name yet.",
+        "Please upload it as soon as possible.",
+        "Thanks!"
+    )
+}
+COMPILED_MESSAGE_TEMPLATES = {
+    scenario: tuple(None if line == '$issues' else Template(line) for line in lines)
+    for scenario, lines in MESSAGE_TEMPLATES.items()
+}
+# Line standing in for $issues when a scenario's message must give a reason
+MESSAGE_ISSUES_FALLBACK = {'takedown': 'Reason: Content policy violation'}
+# Review flags that switch the message to their own scenario
+FLAG_MESSAGE_SCENARIOS = {'Take Down Video': 'takedown', 'Video Ok': 'video_ok'}
+
+def render_message(scenario, first_name='', campaign_name='', issues=None, post_link=None):
+    """Render a suggested message; KeyError for an unknown scenario"""
+    values = {
+        'first_name': first_name,
+        'campaign_name': campaign_name or 'the campaign',
+        'post_link': post_link or 'your post'
+    }
+    lines = []
+    for line in COMPILED_MESSAGE_TEMPLATES[scenario]:
+        if line is None:
+            if issues:
+                lines.extend(issues)
+            elif scenario in MESSAGE_ISSUES_FALLBACK:
+                lines.append(MESSAGE_ISSUES_FALLBACK[scenario])
+        else:
+            lines.append(line.substitute(values))
+    return "\n".join(lines)
+
 def format_suggested_message(first_name, campaign_name, error_parts=None, flag=None, post_link=None):
     """Format the suggested message with feedback option"""
-    if flag == 'Take Down Video':
-        message_lines = [
-            f"Hi {first_name},",
-            f"We are issuing a takedown notice for your recent post for {campaign_name or 'the campaign'}:",
-            *(error_parts or []),
-            f"View it here: {post_link or 'your post'}",
-            "Please take it down promptly.",
-            "Thanks!"
-        ]
-    elif flag == 'Video Ok':
-        message_lines = [
-            f"Hi {first_name},",
-            f"We are confirming that your recent post for {campaign_name or 'the campaign'} is approved:",
-            f"View it here: {post_link or 'your post'}",
-            "It can remain online.",
-            "Thanks!"
-        ]
-    elif error_parts:
-        message_lines = [
-            f"Hi {first_name},",
-            f"We noticed issues with your recent post for {campaign_name or 'the campaign'}:",
-            *error_parts,
-            f"View it here: {post_link or 'your post'}",
-            "Please review and update.",
-            "Thanks!"
-        ]
-    else:
-        message_lines = [
-            f"Hi {first_name},",
-            f"Great job on your recent post for {campaign_name or 'the campaign'}!",
-            f"View it here: {post_link or 'your post'}",
-            "Your content looks perfect and meets all requirements.",
-            "Thank you for your excellent work!",
-            "Keep it up!"
-        ]
-    return "\n".join(message_lines)
+    scenario = FLAG_MESSAGE_SCENARIOS.get(flag) or ('issues' if error_parts else 'approved')
+    return render_message(scenario, first_name, campaign_name, error_parts, post_link)
+
+def with_suggested_message(item):
+    """Add the rendered suggestedMessage to a review item that carries message fields"""
+    if 'messageScenario' in item:
+        item['suggestedMessage'] = render_message(item['messageScenario'], **item['messageFields'])
+    return item
 
 def get_active_influencers():
-    """Get active influencers with their TikTok links"""
-    formula = "AND({Active}='YES')" #, {Audited}='YES'
+    """Active influencers keyed by normalized TikTok link"""
     try:
-        records = tables['influencers'].get_all(formula=formula)
-        return {rec['fields'].get('TiktokLink', '').strip(): rec for rec in records if rec['fields'].get('TiktokLink')}
+        return influencer_directory.active()
+    except AirtableUnavailable:
+        # Surface throttling as an error rather than an empty list
+        raise
     except Exception as e:
         app.logger.error(f"Error getting active influencers: {str(e)}")
         return {}
 
-def get_campaign_posts(campaign_value):
-    """Get posts for a specific campaign"""
+def get_campaign_posts(campaign_value, fields=None, where=None):
+    """Get posts for a specific campaign, optionally only those matching a Formula"""
     try:
-        if campaign_value:
-            formula = f"{{CampaignId}}='{campaign_value}'"
-            return tables['posts'].get_all(formula=formula)
-        return tables['posts'].get_all()
+        mirror = get_mirror()
+        if mirror:
+            return mirror.campaign_posts(campaign_value, where)
+        formula = all_of(campaign_filter(campaign_value), where) if where or campaign_value else None
+        if formula:
+            return get_all_projected('posts', fields, formula=str(formula))
+        return get_all_projected('posts', fields)
+    except AirtableUnavailable:
+        # Surface throttling as an error rather than an empty list
+        raise
     except Exception as e:
         app.logger.error(f"Error getting campaign posts: {str(e)}")
         return []
 
+# --- Field Projection ---
+# table -> field names Airtable rejected, left out of every later projection
+_rejected_fields = defaultdict(set)
+
+def merge_projections(views):
+    """Union of the FIELD_PROJECTIONS of several views, per table"""
+    merged = {}
+    for view in views:
+        for table_name, fields in FIELD_PROJECTIONS[view].items():
+            merged.setdefault(table_name, [])
+            merged[table_name] += [f for f in fields if f not in merged[table_name]]
+    return merged
+
+def _unknown_field_name(error):
+    """Field name from an Airtable 422 UNKNOWN_FIELD_NAME error, if that's what this is"""
+    response = getattr(error, 'response', None)
+    if response is None or response.status_code != 422:
+        return None
+    try:
+        details = response.json().get('error', {})
+    except ValueError:
+        return None
+    if not isinstance(details, dict) or details.get('type') != 'UNKNOWN_FIELD_NAME':
+        return None
+    message = details.get('message', '')
+    return message.split('"')[1] if message.count('"') >= 2 else None
+
+def get_all_projected(table_name, fields, **options):
+    """get_all that only downloads the given fields.
+
+    Several helpers probe alternative spellings of a field, and Airtable
+    rejects the whole request for a field the table doesn't have; such names
+    are dropped and remembered per table, so no other projection of that
+    table probes them again.
+    """
+    if not fields:
+        return tables[table_name].get_all(**options)
+    rejected = _rejected_fields[table_name]
+    fields = [f for f in fields if f not in rejected] or list(fields)
+    while True:
+        try:
+            return tables[table_name].get_all(fields=fields, **options)
+        except requests.HTTPError as e:
+            unknown = _unknown_field_name(e)
+            if unknown not in fields or len(fields) == 1:
+                raise
+            app.logger.warning(f"Field {unknown!r} not in {table_name}; dropping it from projections")
+            rejected.add(unknown)
+            fields.remove(unknown)
+
+# --- Error Log Index ---
+class ErrorLogIndex:
+    """In-memory index of contentErrorLogTable keyed by post ID.
+
+    The first lookup scans the whole table; later refreshes only pull rows
+    whose LAST_MODIFIED_TIME() is after the previous refresh. Each row's
+    description is parsed into missing hashtags and tags as it arrives, so
+    lookups never re-parse. Per-campaign results are memoized until the
+    index changes.
+    """
+
+    # Re-read rows modified this many seconds before the last refresh to
+    # absorb clock skew between us and Airtable
+    OVERLAP_SECONDS = 60
+
+    def __init__(self, table_name='errors'):
+        self.table_name = table_name
+        self.version = 0
+        self._records = {}  # error record ID -> (post IDs, description)
+        self._by_post = defaultdict(dict)  # post ID -> {error record ID: (hashtags, tags)}
+        self._order = {}  # post ID -> sequence number of its first error row
+        self._by_campaign = {}  # campaign value -> (version, post IDs, errors)
+        self._last_refresh = None
+        self._last_rebuild = None
+        self._watermark = None
+        self._mirror_watermark = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Bring the index up to date, at most once per refresh interval"""
+        now = time.monotonic()
+        if not force and self._last_refresh and now - self._last_refresh < ERROR_INDEX_REFRESH_INTERVAL:
+            return
+        # Another thread is already refreshing; serve what we have unless empty
+        if not self._refresh_lock.acquire(blocking=self._last_refresh is None):
+            return
+        try:
+            if not force and self._last_refresh and time.monotonic() - self._last_refresh < ERROR_INDEX_REFRESH_INTERVAL:
+                return
+            started = time.time()
+            rebuild = self._last_rebuild is None or now - self._last_rebuild >= ERROR_INDEX_REBUILD_INTERVAL
+            mirror = get_mirror()
+            fields = FIELD_PROJECTIONS['error_index']['errors']
+            try:
+                if mirror:
+                    # The mirror already pulls modified rows; we only read what
+                    # it wrote since our last refresh, by its local clock
+                    since = self._mirror_watermark if self._mirror_watermark and not rebuild else None
+                    records = mirror.synced_since(self.table_name, since) if since else mirror.all(self.table_name)
+                    rebuild = since is None
+                elif rebuild:
+                    records = get_all_projected(self.table_name, fields, cache=False)
+                else:
+                    formula = str(modified_after(self._watermark))
+                    records = get_all_projected(self.table_name, fields, cache=False, formula=formula)
+            except Exception as e:
+                if self._last_refresh is None:
+                    raise
+                # Keep serving the current index and try again next interval
+                app.logger.error(f"Error refreshing error index: {str(e)}")
+                self._last_refresh = time.monotonic()
+                return
+            self._apply(records, rebuild)
+            self._mirror_watermark = started - self.OVERLAP_SECONDS if mirror else None
+            self._watermark = time.strftime(
+                '%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(started - self.OVERLAP_SECONDS))
+            self._last_refresh = time.monotonic()
+            if rebuild:
+                self._last_rebuild = self._last_refresh
+            app.logger.info(
+                f"Error index {'rebuilt' if rebuild else 'refreshed'}: "
+                f"{len(records)} rows fetched, {len(self._records)} indexed")
+        finally:
+            self._refresh_lock.release()
+
+    def _apply(self, records, rebuild):
+        with self._lock:
+            if rebuild:
+                self._records.clear()
+                self._by_post.clear()
+                self._order.clear()
+            changed = rebuild
+            for error in records:
+                error_fields = error.get('fields', {})
+                post_ids = tuple(str(pid) for pid in ensure_list(error_fields.get('postId', [])))
+                description = error_fields.get('errorDescription', 'Unknown error')
+                entry = (post_ids, description)
+                previous = self._records.get(error['id'])
+                if previous == entry:
+                    continue
+                changed = True
+                if previous:
+                    for pid in previous[0]:
+                        self._by_post[pid].pop(error['id'], None)
+                        if not self._by_post[pid]:
+                            del self._by_post[pid]
+                self._records[error['id']] = entry
+                facts = parse_error_facts(description)
+                for pid in post_ids:
+                    self._by_post[pid][error['id']] = facts
+                    self._order.setdefault(pid, len(self._order))
+            if changed:
+                self.version += 1
+                self._by_campaign.clear()
+
+    def errors_for_posts(self, post_ids):
+        """{post ID: (missing hashtags, missing tags)} for the given posts,
+        merged over each post's error rows, in error log order"""
+        self.refresh()
+        with self._lock:
+            found = [pid for pid in post_ids if pid in self._by_post]
+            found.sort(key=self._order.get)
+            errors = {}
+            for pid in found:
+                facts = self._by_post[pid].values()
+                errors[pid] = (frozenset().union(*(hashtags for hashtags, _ in facts)),
+                               frozenset().union(*(tags for _, tags in facts)))
+            return errors
+
+    def errors_for_campaign(self, campaign_value, post_ids):
+        """Memoized errors_for_posts for one campaign's post IDs"""
+        self.refresh()
+        post_ids = frozenset(post_ids)
+        with self._lock:
+            cached = self._by_campaign.get(campaign_value)
+            if cached and cached[0] == self.version and cached[1] == post_ids:
+                return cached[2]
+        errors = self.errors_for_posts(post_ids)
+        with self._lock:
+            self._by_campaign[campaign_value] = (self.version, post_ids, errors)
+        return errors
+
+    def campaign_stats(self, campaign_value, post_ids, limit=10):
+        """Most often missing hashtags and tags across a campaign's posts"""
+        errors = self.errors_for_campaign(campaign_value, post_ids)
+        hashtag_counts = defaultdict(int)
+        tag_counts = defaultdict(int)
+        for hashtags, tags in errors.values():
+            for hashtag in hashtags:
+                hashtag_counts[hashtag] += 1
+            for tag in tags:
+                tag_counts[tag] += 1
+
+        def top(counts, key):
+            ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [{key: value, 'posts': count} for value, count in ranked]
+
+        return {
+            'posts_with_errors': len(errors),
+            'missing_hashtags': top(hashtag_counts, 'hashtag'),
+            'missing_tags': top(tag_counts, 'tag')
+        }
+
+    def stats(self):
+        parse_cache = parse_error_facts.cache_info()
+        with self._lock:
+            return {
+                'version': self.version,
+                'error_rows': len(self._records),
+                'posts_with_errors': len(self._by_post),
+                'campaigns_memoized': len(self._by_campaign),
+                'watermark': self._watermark,
+                'parse_cache': {'hits': parse_cache.hits, 'misses': parse_cache.misses,
+                                'size': parse_cache.currsize}
+            }
+
+error_index = ErrorLogIndex()
+
+# --- Campaign Directory ---
+class CampaignDirectory:
+    """Record ID <-> campaign value <-> name lookups from one campaignTable scan.
+
+    The directory reloads when its TTL expires, when refresh() is called, or
+    (at most every few seconds) when asked about a record ID it has not seen,
+    so newly created campaigns show up without waiting for the TTL.
+    """
+
+    MISS_REFRESH_INTERVAL = 10
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._records = []
+        self._by_id = {}
+        self._id_by_value = {}
+        self._id_by_name = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Reload the directory with a single campaignTable scan"""
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        mirror = get_mirror()
+        if mirror:
+            records = mirror.all('campaigns')
+        else:
+            records = get_all_projected(
+                'campaigns', FIELD_PROJECTIONS['campaign_select']['campaigns'], cache=False)
+
+        by_id, id_by_value, id_by_name = {}, {}, {}
+        # Later value fields only fill gaps, matching the old per-field search order
+        for field_name in CAMPAIGN_VALUE_FIELDS:
+            for record in records:
+                value = _formula_text(record.get('fields', {}).get(field_name))
+                if value:
+                    id_by_value.setdefault(value, record['id'])
+        for record in records:
+            by_id[record['id']] = record
+            name = _campaign_name(record.get('fields', {}))
+            if name:
+                id_by_name.setdefault(name, record['id'])
+
+        self._records, self._by_id = records, by_id
+        self._id_by_value, self._id_by_name = id_by_value, id_by_name
+        self._loaded_at = time.monotonic()
+        app.logger.info(f"Campaign directory loaded: {len(records)} campaigns")
+
+    def _is_stale(self, missing_id=None):
+        if self._loaded_at is None:
+            return True
+        age = time.monotonic() - self._loaded_at
+        if age >= self.ttl:
+            return True
+        return bool(missing_id) and missing_id not in self._by_id and age >= self.MISS_REFRESH_INTERVAL
+
+    def _ensure_loaded(self, missing_id=None):
+        if not self._is_stale(missing_id):
+            return
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            if not self._is_stale(missing_id):
+                return
+            try:
+                self._reload()
+            except Exception as e:
+                # Keep serving the previous directory until Airtable recovers
+                app.logger.error(f"Error loading campaign directory: {str(e)}")
+                if self._loaded_at is None:
+                    raise
+
+    def records(self):
+        """All campaign records in table order"""
+        self._ensure_loaded()
+        return self._records
+
+    def get(self, record_id):
+        """Campaign record by Airtable record ID"""
+        if not record_id:
+            return None
+        self._ensure_loaded(record_id)
+        return self._by_id.get(record_id)
+
+    def get_by_value(self, campaign_value):
+        """Campaign record by its CampaignID-style value"""
+        if not campaign_value:
+            return None
+        self._ensure_loaded()
+        return self._by_id.get(self._id_by_value.get(str(campaign_value)))
+
+    def get_by_name(self, name):
+        """Campaign record by display name"""
+        self._ensure_loaded()
+        return self._by_id.get(self._id_by_name.get(name))
+
+    def stats(self):
+        return {
+            'campaigns': len(self._by_id),
+            'values': len(self._id_by_value),
+            'names': len(self._id_by_name),
+            'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            'ttl': self.ttl
+        }
+
+def _campaign_name(fields):
+    """First non-empty display name field of a campaign"""
+    for field_name in CAMPAIGN_NAME_FIELDS:
+        if field_name in fields and fields[field_name]:
+            return fields[field_name]
+    return None
+
+campaign_directory = CampaignDirectory(CAMPAIGN_DIRECTORY_TTL)
+
+# --- Influencer Directory ---
+def normalize_profile_url(url):
+    """Comparison key for a profile link: host and path in lower case, without
+    scheme, www., query string, fragment or trailing slash"""
+    text = (_formula_text(url) or '').strip()
+    if not text:
+        return ''
+    parsed = urlparse(text if '://' in text else f'https://{text}')
+    host = parsed.netloc.lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    return (host + unquote(parsed.path).rstrip('/')).lower()
+
+def normalize_name(name):
+    """Comparison key for a name: case and runs of whitespace folded"""
+    return ' '.join((_formula_text(name) or '').split()).casefold()
+
+class InfluencerDirectory:
+    """influencerTable indexed by record ID, normalized TikTok and Instagram
+    links and normalized name.
+
+    The first lookup loads the whole table; later refreshes only pull rows
+    whose LAST_MODIFIED_TIME() is after the previous refresh, at most once
+    per interval, and a periodic full reload drops deleted influencers.
+    Where several influencers share a key, lookups return the last one in
+    table order.
+    """
+
+    OVERLAP_SECONDS = 60
+    # Index name -> function of a record's fields giving its key
+    KEYS = {
+        'tiktok': lambda fields: normalize_profile_url(fields.get('TiktokLink')),
+        'instagram': lambda fields: normalize_profile_url(fields.get('InstagramLink')),
+        'name': lambda fields: normalize_name(fields.get('Name'))
+    }
+
+    def __init__(self, table_name='influencers'):
+        self.table_name = table_name
+        self.version = 0
+        self._records = {}  # record ID -> record
+        self._order = {}  # record ID -> sequence number, in table order
+        self._indexes = {index: defaultdict(dict) for index in self.KEYS}  # key -> {record ID: None}
+        self._active = (None, {})  # (version, {TikTok key: record})
+        self._last_refresh = None
+        self._last_rebuild = None
+        self._watermark = None
+        self._mirror_watermark = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Bring the directory up to date, at most once per refresh interval"""
+        now = time.monotonic()
+        if not force and self._last_refresh and now - self._last_refresh < INFLUENCER_DIRECTORY_REFRESH_INTERVAL:
+            return
+        # Another thread is already refreshing; serve what we have unless empty
+        if not self._refresh_lock.acquire(blocking=self._last_refresh is None):
+            return
+        try:
+            if not force and self._last_refresh and time.monotonic() - self._last_refresh < INFLUENCER_DIRECTORY_REFRESH_INTERVAL:
+                return
+            started = time.time()
+            rebuild = self._last_rebuild is None or now - self._last_rebuild >= INFLUENCER_DIRECTORY_REBUILD_INTERVAL
+            mirror = get_mirror()
+            fields = FIELD_PROJECTIONS['influencer_directory']['influencers']
+            try:
+                if mirror:
+                    since = self._mirror_watermark if self._mirror_watermark and not rebuild else None
+                    records = mirror.synced_since(self.table_name, since) if since else mirror.all(self.table_name)
+                    rebuild = since is None
+                elif rebuild:
+                    records = get_all_projected(self.table_name, fields, cache=False)
+                else:
+                    formula = str(modified_after(self._watermark))
+                    records = get_all_projected(self.table_name, fields, cache=False, formula=formula)
+            except Exception as e:
+                if self._last_refresh is None:
+                    raise
+                # Keep serving the current directory and try again next interval
+                app.logger.error(f"Error refreshing influencer directory: {str(e)}")
+                self._last_refresh = time.monotonic()
+                return
+            self._apply(records, rebuild)
+            self._mirror_watermark = started - self.OVERLAP_SECONDS if mirror else None
+            self._watermark = time.strftime(
+                '%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(started - self.OVERLAP_SECONDS))
+            self._last_refresh = time.monotonic()
+            if rebuild:
+                self._last_rebuild = self._last_refresh
+            app.logger.info(
+                f"Influencer directory {'rebuilt' if rebuild else 'refreshed'}: "
+                f"{len(records)} rows fetched, {len(self._records)} indexed")
+        finally:
+            self._refresh_lock.release()
+
+    def _apply(self, records, rebuild):
+        with self._lock:
+            if rebuild:
+                self._records.clear()
+                self._order.clear()
+                for index in self._indexes.values():
+                    index.clear()
+            changed = rebuild
+            for record in records:
+                previous = self._records.get(record['id'])
+                if previous is not None and previous.get('fields') == record.get('fields'):
+                    continue
+                changed = True
+                if previous is not None:
+                    self._unindex(previous)
+                self._records[record['id']] = record
+                self._order.setdefault(record['id'], len(self._order))
+                self._index(record)
+            if changed:
+                self.version += 1
+
+    def _index(self, record):
+        fields = record.get('fields', {})
+        for index, key_of in self.KEYS.items():
+            key = key_of(fields)
+            if key:
+                self._indexes[index][key][record['id']] = None
+
+    def _unindex(self, record):
+        fields = record.get('fields', {})
+        for index, key_of in self.KEYS.items():
+            key = key_of(fields)
+            ids = self._indexes[index].get(key)
+            if ids is not None:
+                ids.pop(record['id'], None)
+                if not ids:
+                    del self._indexes[index][key]
+
+    def record_written(self, record_id, fields):
+        """Apply an edit this app just wrote to Airtable"""
+        with self._lock:
+            record = self._records.get(record_id)
+            if record is not None:
+                self._apply([_patched(record, fields)], rebuild=False)
+
+    def _find(self, index, key):
+        if not key:
+            return None
+        self.refresh()
+        with self._lock:
+            ids = self._indexes[index].get(key)
+            if not ids:
+                return None
+            return self._records[max(ids, key=self._order.get)]
+
+    def get(self, record_id):
+        """Influencer record by Airtable record ID"""
+        if not record_id:
+            return None
+        self.refresh()
+        return self._records.get(record_id)
+
+    def find_by_tiktok(self, url):
+        return self._find('tiktok', normalize_profile_url(url))
+
+    def find_by_instagram(self, url):
+        return self._find('instagram', normalize_profile_url(url))
+
+    def find_by_name(self, name):
+        return self._find('name', normalize_name(name))
+
+    def contact_number(self, name):
+        """Contact number of the influencer with this name, or ''"""
+        record = self.find_by_name(name)
+        return str(record['fields'].get('ContactNumber', '')) if record else ''
+
+    def active(self):
+        """Active influencers with a TikTok link, keyed by normalized link"""
+        self.refresh()
+        with self._lock:
+            version, active = self._active
+            if version != self.version:
+                active = {}
+                # Records stay in the order they were first seen: table order
+                for record in self._records.values():
+                    fields = record.get('fields', {})
+                    key = self.KEYS['tiktok'](fields)
+                    if key and ACTIVE_INFLUENCER_FILTER.matches(fields):
+                        active[key] = record
+                self._active = (self.version, active)
+            return active
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'influencers': len(self._records),
+                'keys': {index: len(keys) for index, keys in self._indexes.items()},
+                'watermark': self._watermark,
+                'age_seconds': round(time.monotonic() - self._last_refresh, 1) if self._last_refresh else None
+            }
+
+influencer_directory = InfluencerDirectory()
+
+# --- Campaign Snapshot ---
+class CampaignSnapshot:
+    """Campaign data shared by every builder within one request.
+
+    Posts, error logs, influencers and campaign metadata are each loaded
+    from Airtable at most once, the first time a builder asks for them.
+    """
+
+    def __init__(self, campaign_id='', views=()):
+        self.campaign_id = campaign_id
+        # Columns to fetch per table: the union of what the request's views read
+        self.projection = merge_projections(views) if views else {}
+        # Posts to fetch: those any of the request's views keeps
+        self.post_filter = merge_post_filters(views)
+        self._loaded = {}
+
+    def _load(self, key, loader):
+        if key not in self._loaded:
+            try:
+                self._loaded[key] = (True, loader())
+            except Exception as e:
+                # Remember the failure so a prefetch error isn't retried serially
+                self._loaded[key] = (False, e)
+        ok, value = self._loaded[key]
+        if not ok:
+            raise value
+        return value
+
+    def prefetch(self, *names):
+        """Load several attributes at once on the fetch pool.
+
+        Only independent reads are worth prefetching: posts, active_influencers
+        and campaign_name. Asking for errors or influencers refreshes the error
+        index or the influencer directory alongside them.
+        """
+        # Every loader depends on the campaign value, so resolve it first
+        self.campaign_value
+        loaders = {name: (lambda name=name: getattr(self, name))
+                   for name in names if name not in ('errors', 'influencers') and name not in self._loaded}
+        if 'errors' in names and 'errors' not in self._loaded:
+            loaders['error_index'] = error_index.refresh
+        if 'influencers' in names:
+            loaders['influencer_directory'] = influencer_directory.refresh
+        if len(loaders) < 2:
+            return
+        try:
+            fetch_parallel(loaders)
+        except Exception:
+            # Failures are stored by _load and raised where the data is used
+            pass
+
+    @property
+    def campaign_value(self):
+        def load():
+            if not self.campaign_id:
+                return ''
+            try:
+                return get_campaign_value(self.campaign_id)
+            except Exception as e:
+                app.logger.error(f"Error getting campaign value: {str(e)}")
+                return ''
+        return self._load('campaign_value', load)
+
+    @property
+    def campaign_name(self):
+        return self._load('campaign_name', lambda: get_campaign_name_from_value(self.campaign_value))
+
+    @property
+    def posts(self):
+        return self._load('posts', lambda: get_campaign_posts(
+            self.campaign_value, self.projection.get('posts'), self.post_filter))
+
+    @property
+    def post_id_to_record(self):
+        """Post ID (as used by the error log) -> post record"""
+        def build():
+            mapping = {}
+            for post in self.posts:
+                fields = post.get('fields', {})
+                for field in POST_ID_FIELDS:
+                    if field in fields and fields[field]:
+                        mapping[str(fields[field])] = post
+                        break
+            return mapping
+        return self._load('post_id_to_record', build)
+
+    @property
+    def errors(self):
+        """Post ID -> (missing hashtags, missing tags), for this campaign's posts only"""
+        return self._load('errors', lambda: error_index.errors_for_campaign(
+            self.campaign_value, self.post_id_to_record.keys()))
+
+    @property
+    def active_influencers(self):
+        """Normalized TikTok link -> active influencer, fixed for the request"""
+        return self._load('active_influencers', get_active_influencers)
+
+    @property
+    def posts_with_issues(self):
+        return self._load('posts_with_issues', lambda: get_all_posts_with_issues(self))
+
+# --- Summary Counters ---
+def content_etag(value):
+    """ETag from a JSON-serializable value, the same in every worker that holds it"""
+    return hashlib.blake2b(json.dumps(value, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+class CampaignCounts:
+    """Summary counts for one campaign and the per-post state behind them"""
+
+    def __init__(self, campaign_value):
+        self.campaign_value = campaign_value
+        self.posts = {}  # post record ID -> summary fields
+        self.posted_links = defaultdict(int)  # normalized TikTok link -> posts with that link
+        self.with_issues = 0
+        self.no_issues = 0
+        self.manual_review = 0
+        self.version = 0
+        self.cached = (None, None, None)  # (versions, etag, summary dict)
+
+    def includes(self, fields):
+        """True if a post with these fields belongs to this campaign"""
+        if not self.campaign_value:
+            return True
+        return _formula_text(fields.get('CampaignId')) == _formula_text(self.campaign_value)
+
+    def add(self, post_id, fields):
+        self.posts[post_id] = fields
+        self._count(fields, 1)
+
+    def remove(self, post_id):
+        fields = self.posts.pop(post_id, None)
+        if fields is not None:
+            self._count(fields, -1)
+
+    def _count(self, fields, sign):
+        tiktok_link = normalize_profile_url(fields.get('TikTokLink'))
+        if tiktok_link:
+            self.posted_links[tiktok_link] += sign
+            if not self.posted_links[tiktok_link]:
+                del self.posted_links[tiktok_link]
+        quality = (fields.get('PostQuality') or '').strip()
+        if quality == 'All Correct':
+            self.no_issues += sign
+        elif quality == 'Partially Correct/Incorrect':
+            self.with_issues += sign
+        # Posts with no ManualFlag still need manual review
+        if not fields.get('ManualFlag'):
+            self.manual_review += sign
+
+class SummaryCounters:
+    """Per-campaign summary counts kept current without rescanning.
+
+    A campaign's counts are built from a full scan the first time it is
+    asked for; the portfolio builds every campaign not yet counted from one
+    scan of the posts table, grouped by CampaignId. After that, review edits
+    made here are applied as they are written, and records modified in
+    Airtable (or synced into the mirror) are pulled as deltas at most once
+    per refresh interval, shared by every campaign. Each change bumps a
+    version that, with the influencer directory's version, says when a
+    summary has to be recomputed. ETags hash the summary itself, so workers
+    holding the same counts agree on them.
+    """
+
+    OVERLAP_SECONDS = 60
+    POST_FIELDS = ('TikTokLink', 'PostQuality', 'ManualFlag', 'CampaignId')
+
+    def __init__(self):
+        self._campaigns = {}  # campaign record ID -> CampaignCounts
+        self._version = 0
+        self._watermark = None
+        self._mirror_watermark = None
+        self._last_refresh = None
+        self._last_rebuild = None
+        self._stats = defaultdict(int)
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._changed = threading.Event()
+
+    def wait_for_change(self, timeout):
+        """Block until counts change or timeout passes; True if they changed"""
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+    def summary(self, campaign_id):
+        """(etag, summary data) for a campaign"""
+        self.refresh()
+        entry = self._campaigns.get(campaign_id) or self._build([campaign_id])[campaign_id]
+        return self._summarize(entry, influencer_directory.active())
+
+    def portfolio(self):
+        """(etag, [summary data per campaign]) for every campaign in the directory"""
+        self.refresh()
+        campaigns = campaign_directory.records()
+        missing = [campaign['id'] for campaign in campaigns if campaign['id'] not in self._campaigns]
+        built = self._build(missing) if missing else {}
+        active_links = influencer_directory.active()
+
+        rows = []
+        for campaign in campaigns:
+            entry = self._campaigns.get(campaign['id']) or built.get(campaign['id'])
+            rows.append({
+                'campaign_id': campaign['id'],
+                'campaign_name': _campaign_name(campaign.get('fields', {})) or 'Unnamed Campaign',
+                **self._summarize(entry, active_links)[1]
+            })
+        return content_etag(rows), rows
+
+    def _summarize(self, entry, active_links):
+        with self._lock:
+            versions = (entry.version, influencer_directory.version)
+            if entry.cached[0] != versions:
+                # Walk the campaign's posted links rather than every active influencer
+                loaded = sum(1 for link in entry.posted_links if link in active_links)
+                summary = {
+                    "number_of_influencers": len(active_links),
+                    "videos_with_no_issues": entry.no_issues,
+                    "videos_with_issues": entry.with_issues,
+                    "videos_not_loaded_yet": len(active_links) - loaded,
+                    "videos_for_manual_review": entry.manual_review,
+                }
+                entry.cached = (versions, content_etag(summary), summary)
+            return entry.cached[1:]
+
+    def _build(self, campaign_ids):
+        """{campaign ID: counts} from one scan of the posts those campaigns need,
+        loading the influencer directory alongside.
+
+        A single campaign reads only its own posts; several read the whole
+        table once and share it out by CampaignId.
+        """
+        started = time.time()
+        entries = {campaign_id: CampaignCounts(get_campaign_value(campaign_id) if campaign_id else '')
+                   for campaign_id in campaign_ids}
+        mirror = get_mirror()
+
+        def load_posts():
+            campaign_value = next(iter(entries.values())).campaign_value if len(entries) == 1 else ''
+            if mirror:
+                return mirror.campaign_posts(campaign_value)
+            options = {'formula': str(campaign_filter(campaign_value))} if campaign_value else {}
+            return get_all_projected('posts', list(self.POST_FIELDS), cache=False, **options)
+
+        loaded = fetch_parallel({'posts': load_posts, 'influencers': influencer_directory.refresh})
+
+        by_value = defaultdict(list)
+        every_post = []  # campaigns without a value count every post
+        for entry in entries.values():
+            if entry.campaign_value:
+                by_value[_formula_text(entry.campaign_value)].append(entry)
+            else:
+                every_post.append(entry)
+        for post in loaded['posts']:
+            fields = self._post_fields(post)
+            for entry in by_value.get(_formula_text(fields.get('CampaignId')), []) + every_post:
+                entry.add(post['id'], fields)
+
+        with self._lock:
+            if self._watermark is None:
+                self._set_watermarks(started, mirror)
+                self._last_refresh = self._last_rebuild = time.monotonic()
+            for campaign_id, entry in entries.items():
+                self._version += 1
+                entry.version = self._version
+                self._campaigns[campaign_id] = entry
+            self._stats['builds'] += 1
+            self._stats['campaigns_built'] += len(entries)
+        app.logger.info(f"Summary counters built for {len(entries)} campaign(s) "
+                        f"from {len(loaded['posts'])} posts")
+        return entries
+
+    def refresh(self):
+        """Apply records modified since the last refresh, at most once per interval"""
+        if self._watermark is None:
+            return
+        now = time.monotonic()
+        if now - self._last_refresh < SUMMARY_REFRESH_INTERVAL:
+            return
+        # Another thread is already refreshing; serve the current counts
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if now - self._last_rebuild >= SUMMARY_REBUILD_INTERVAL:
+                # Deleted records never show up in a delta; start over
+                self.reset()
+                return
+            started = time.time()
+            mirror = get_mirror()
+            try:
+                if mirror and self._mirror_watermark:
+                    posts = mirror.synced_since('posts', self._mirror_watermark)
+                else:
+                    formula = str(modified_after(self._watermark))
+                    posts = get_all_projected('posts', list(self.POST_FIELDS), cache=False, formula=formula)
+            except Exception as e:
+                # Keep serving the current counts and try again next interval
+                app.logger.error(f"Error refreshing summary counters: {str(e)}")
+                self._last_refresh = time.monotonic()
+                return
+            with self._lock:
+                for post in posts:
+                    self._apply_post(post['id'], self._post_fields(post))
+                self._set_watermarks(started, mirror)
+                self._last_refresh = time.monotonic()
+                self._stats['refreshes'] += 1
+                self._stats['delta_records'] += len(posts)
+        finally:
+            self._refresh_lock.release()
+
+    def reset(self):
+        """Drop every campaign's counts; they are rebuilt on next use"""
+        with self._lock:
+            self._campaigns.clear()
+            self._watermark = self._mirror_watermark = None
+            self._stats['resets'] += 1
+        self._changed.set()
+
+    def record_written(self, table_name, record_id, fields):
+        """Apply an edit this app just wrote to Airtable"""
+        with self._lock:
+            if table_name == 'posts':
+                for entry in self._campaigns.values():
+                    if record_id in entry.posts:
+                        self._apply_post(record_id, {**entry.posts[record_id], **self._post_fields({'fields': fields})})
+                        break
+            self._stats['writes'] += 1
+
+    def _apply_post(self, post_id, fields):
+        for entry in self._campaigns.values():
+            current = entry.posts.get(post_id)
+            if current == fields:
+                continue
+            if current is None and not entry.includes(fields):
+                continue
+            entry.remove(post_id)
+            if entry.includes(fields):
+                entry.add(post_id, fields)
+            self._version += 1
+            entry.version = self._version
+            self._changed.set()
+
+    def _set_watermarks(self, started, mirror):
+        self._mirror_watermark = started - self.OVERLAP_SECONDS if mirror else None
+        self._watermark = time.strftime(
+            '%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(started - self.OVERLAP_SECONDS))
+
+    def _post_fields(self, post):
+        fields = post.get('fields', {})
+        return {field: fields[field] for field in self.POST_FIELDS if field in fields}
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                'campaigns': {campaign_id or '(all)': {'posts': len(entry.posts), 'version': entry.version}
+                              for campaign_id, entry in self._campaigns.items()},
+                'version': self._version,
+                'watermark': self._watermark
+            }
+
+summary_counters = SummaryCounters()
+
+# --- Event Stream ---
+def format_sse(event, data):
+    """One server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+class EventBroker:
+    """Pushes audit and summary changes to connected dashboards.
+
+    Each /events stream subscribes a bounded queue for its campaign. A single
+    watcher thread recomputes a campaign's summary when the counters change
+    (or every refresh interval, to pick up Airtable deltas) and, if its ETag
+    moved, serializes one frame and hands it to every subscriber.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._subscribers = defaultdict(set)  # campaign ID -> subscriber queues
+        self._etags = {}  # campaign ID -> ETag of the last summary pushed
+        self._audits = {}  # campaign ID -> audit state last pushed
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = defaultdict(int)
+
+    def subscribe(self, campaign_id):
+        q = queue.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[campaign_id].add(q)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='event-broker', daemon=True)
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, campaign_id, q):
+        with self._lock:
+            subscribers = self._subscribers.get(campaign_id)
+            if subscribers is not None:
+                subscribers.discard(q)
+                if not subscribers:
+                    del self._subscribers[campaign_id]
+                    self._etags.pop(campaign_id, None)
+                    self._audits.pop(campaign_id, None)
+
+    def is_subscribed(self, campaign_id, q):
+        with self._lock:
+            return q in self._subscribers.get(campaign_id, ())
+
+    def publish(self, campaign_id, event, data):
+        """Send one event to every stream open for a campaign"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(campaign_id, ()))
+        if not subscribers:
+            return
+        frame = format_sse(event, data)
+        for q in subscribers:
+            try:
+                q.put_nowait(frame)
+            except queue.Full:
+                # The client stopped reading; drop it and let the browser reconnect
+                self.unsubscribe(campaign_id, q)
+                self._stats['dropped'] += 1
+        self._stats[f'{event}_events'] += 1
+        self._stats['frames_sent'] += len(subscribers)
+
+    def publish_audit(self, campaign_id, active):
+        """Push an audit state change, once per change"""
+        with self._lock:
+            if campaign_id not in self._subscribers or self._audits.get(campaign_id) == active:
+                return
+            self._audits[campaign_id] = active
+        self.publish(campaign_id, 'audit', {'active': active})
+
+    def _run(self):
+        while True:
+            summary_counters.wait_for_change(self.interval)
+            with self._lock:
+                campaign_ids = list(self._subscribers)
+            for campaign_id in campaign_ids:
+                # Audits started or finished by other workers
+                self.publish_audit(campaign_id, is_audit_active(campaign_id))
+                try:
+                    etag, summary_data = get_campaign_summary(campaign_id)
+                except Exception as e:
+                    app.logger.error(f"Event summary error for {campaign_id}: {str(e)}")
+                    continue
+                if etag and self._etags.get(campaign_id) == etag:
+                    continue
+                self._etags[campaign_id] = etag
+                self.publish(campaign_id, 'summary', summary_data)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                'streams': {campaign_id or '(all)': len(subscribers)
+                            for campaign_id, subscribers in self._subscribers.items()}
+            }
+
+event_broker = EventBroker(EVENTS_POLL_INTERVAL)
+
+def set_audit_active(campaign_id, active):
+    """Record an audit starting or finishing and tell the campaign's dashboards"""
+    if active:
+        state_backend.set(f'audit-active:{campaign_id}', True, ttl=AUDIT_STALE_AFTER)
+    else:
+        state_backend.delete(f'audit-active:{campaign_id}')
+    event_broker.publish_audit(campaign_id, active)
+
+def is_audit_active(campaign_id):
+    return state_backend.get(f'audit-active:{campaign_id}') is not None
+
+def active_audits():
+    """IDs of campaigns with an audit in progress, across all workers"""
+    return sorted(key[len('audit-active:'):] for key in state_backend.scan('audit-active:'))
+
+# --- Audit Jobs ---
+class AuditScheduler:
+    """Runs audit triggers on a fixed pool of workers, one job per campaign at a time.
+
+    Starting an audit for a campaign that already has one queued or running
+    joins that job instead of sending a second trigger. Jobs move through
+    queued -> running -> done/failed; the campaign keeps showing as auditing
+    for AUDIT_ACTIVE_GRACE seconds after its trigger returns. Jobs live in
+    the state backend, so deduplication and /audit_jobs span worker processes.
+    """
+
+    def __init__(self, workers, state):
+        self.state = state
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='audit')
+
+    def submit(self, campaign_id, campaign_name):
+        """Queue an audit; returns (job, created), joining an unfinished job if there is one"""
+        job = {
+            'id': f"audit-{int(time.time() * 1000)}-{random.getrandbits(16):04x}",
+            'campaign_id': campaign_id,
+            'campaign_name': campaign_name,
+            'state': 'queued',
+            'queued_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'duration': None,
+            'error': None,
+            'coalesced': 0
+        }
+        owner = self.state.update(
+            f'audit-running:{campaign_id}', lambda current: current or job['id'], ttl=AUDIT_STALE_AFTER)
+        if owner != job['id']:
+            joined = self.state.update(
+                f'audit-job:{owner}',
+                lambda current: current and {**current, 'coalesced': current['coalesced'] + 1},
+                ttl=AUDIT_JOB_TTL)
+            if joined:
+                return joined, False
+            # The running job's record is gone; take the campaign over
+            self.state.set(f'audit-running:{campaign_id}', job['id'], ttl=AUDIT_STALE_AFTER)
+
+        self.state.set(f'audit-job:{job["id"]}', job, ttl=AUDIT_JOB_TTL)
+        self.state.set(f'audit-latest:{campaign_id}', job['id'], ttl=AUDIT_STALE_AFTER)
+        set_audit_active(campaign_id, True)
+        self._executor.submit(self._run, job['id'], campaign_id, campaign_name)
+        return job, True
+
+    def _update(self, job_id, **changes):
+        return self.state.update(
+            f'audit-job:{job_id}', lambda current: current and {**current, **changes}, ttl=AUDIT_JOB_TTL)
+
+    def _run(self, job_id, campaign_id, campaign_name):
+        started = time.time()
+        self._update(job_id, state='running', started_at=started)
+        try:
+            trigger_n8n_audit(campaign_name)
+            state, error = 'done', None
+        except Exception as e:
+            app.logger.error(f"Error triggering audit: {str(e)}")
+            state, error = 'failed', str(e)
+        finished = time.time()
+        self._update(job_id, state=state, error=error, finished_at=finished,
+                     duration=round(finished - started, 3))
+        self.state.update(
+            f'audit-running:{campaign_id}', lambda current: None if current == job_id else current)
+        # Clear the indicator later without holding a worker
+        timer = threading.Timer(AUDIT_ACTIVE_GRACE, self._expire, args=(job_id, campaign_id))
+        timer.daemon = True
+        timer.start()
+
+    def _expire(self, job_id, campaign_id):
+        # A newer job for the campaign owns the indicator now
+        if self.state.get(f'audit-latest:{campaign_id}') != job_id:
+            return
+        set_audit_active(campaign_id, False)
+
+    def get(self, job_id):
+        return self.state.get(f'audit-job:{job_id}')
+
+    def jobs(self, campaign_id=None):
+        """Jobs, newest first, optionally for one campaign"""
+        jobs = [job for job in self.state.scan('audit-job:').values()
+                if campaign_id is None or job['campaign_id'] == campaign_id]
+        return sorted(jobs, key=lambda job: job['queued_at'], reverse=True)
+
+audit_scheduler = AuditScheduler(AUDIT_WORKERS, state_backend)
+
+# --- Write Queue ---
+class WriteQueue:
+    """Coalescing write-behind queue for record updates.
+
+    Updates to the same record are merged while they wait. A flusher thread
+    sends them to Airtable in PATCHes of up to WRITE_BATCH_SIZE records,
+    WRITE_FLUSH_INTERVAL seconds after the first one arrives (sooner once a
+    full batch is waiting). submit() returns a Future per update.
+    """
+
+    def __init__(self, table_name, flush_interval, batch_size):
+        self.table_name = table_name
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = OrderedDict()  # record ID -> (merged fields, [futures])
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stats = defaultdict(int)
+
+    def submit(self, record_id, fields):
+        """Queue a field update; the Future resolves once it is written"""
+        future = Future()
+        with self._cond:
+            entry = self._pending.get(record_id)
+            if entry:
+                entry[0].update(fields)
+                entry[1].append(future)
+                self._stats['coalesced'] += 1
+            else:
+                self._pending[record_id] = (dict(fields), [future])
+            self._stats['submitted'] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f'write-queue-{self.table_name}', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Give related edits a moment to arrive and coalesce
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.batch_size and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                batch, self._pending = self._pending, OrderedDict()
+            self._flush(list(batch.items()))
+
+    def _flush(self, items):
+        for start in range(0, len(items), self.batch_size):
+            chunk = items[start:start + self.batch_size]
+            try:
+                tables[self.table_name].batch_update(
+                    [{'id': record_id, 'fields': fields} for record_id, (fields, _) in chunk])
+                self._stats['batches'] += 1
+                self._stats['records_written'] += len(chunk)
+                for _, (_, futures) in chunk:
+                    _resolve(futures, result={'status': 'success'})
+            except Exception as e:
+                if len(chunk) == 1 or isinstance(e, AirtableUnavailable):
+                    self._stats['failed'] += len(chunk)
+                    for _, (_, futures) in chunk:
+                        _resolve(futures, error=e)
+                    continue
+                # One bad record rejects the whole PATCH; retry singly to isolate it
+                app.logger.error(f"Batch update failed, retrying records singly: {str(e)}")
+                self._flush_singly(chunk)
+
+    def _flush_singly(self, chunk):
+        for record_id, (fields, futures) in chunk:
+            try:
+                tables[self.table_name].update(record_id, fields)
+                self._stats['records_written'] += 1
+                _resolve(futures, result={'status': 'success'})
+            except Exception as e:
+                self._stats['failed'] += 1
+                _resolve(futures, error=e)
+
+    def stats(self):
+        with self._cond:
+            return {**self._stats, 'pending': len(self._pending)}
+
+def _resolve(futures, result=None, error=None):
+    for future in futures:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+post_updates = WriteQueue('posts', WRITE_FLUSH_INTERVAL, WRITE_BATCH_SIZE)
+
+# --- Warm-up ---
+warmup_status = {'state': 'pending', 'started_at': None, 'finished_at': None, 'steps': {}}
+
+def _warm_up_connection():
+    tables['influencers'].get_all(max_records=1)
+    app.logger.info("Airtable connection successful")
+
+def _warm_up_influencers():
+    influencer_directory.refresh()
+
+WARMUP_STEPS = [
+    ('connection', _warm_up_connection),
+    ('campaign_directory', lambda: campaign_directory.refresh()),
+    ('influencer_directory', _warm_up_influencers)
+]
+
+def warm_up():
+    """Make the first Airtable calls in the background so requests find warm caches.
+
+    Failed steps are retried with backoff until they succeed, so an Airtable
+    outage at boot doesn't leave the worker degraded for good.
+    """
+    warmup_status.update(state='running', started_at=time.time())
+    pending = list(WARMUP_STEPS)
+    backoff = WARMUP_RETRY_BACKOFF
+    while True:
+        failed = []
+        for name, step in pending:
+            attempts = warmup_status['steps'].get(name, {}).get('attempts', 0) + 1
+            warmup_status['steps'][name] = {'state': 'running', 'attempts': attempts}
+            started = time.monotonic()
+            try:
+                step()
+                warmup_status['steps'][name] = {'state': 'done', 'attempts': attempts}
+            except Exception as e:
+                app.logger.error(f"Warm-up step {name} failed (attempt {attempts}): {str(e)}")
+                warmup_status['steps'][name] = {'state': 'failed', 'attempts': attempts, 'error': str(e)}
+                failed.append((name, step))
+            warmup_status['steps'][name]['seconds'] = round(time.monotonic() - started, 3)
+        if not failed:
+            break
+        warmup_status.update(state='retrying', retry_at=time.time() + backoff)
+        app.logger.info(f"Retrying {len(failed)} warm-up step(s) in {backoff}s")
+        time.sleep(backoff)
+        backoff = min(backoff * 2, WARMUP_MAX_RETRY_BACKOFF)
+        pending = failed
+    warmup_status.pop('retry_at', None)
+    warmup_status.update(state='ready', finished_at=time.time())
+    app.logger.info(f"Warm-up ready in {warmup_status['finished_at'] - warmup_status['started_at']:.2f}s")
+
+if tables:
+    threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
 # --- Core Business Logic ---
-def trigger_n8n_audit(campaign_id):
-    """Background task to trigger n8n audit"""
+def trigger_n8n_audit(campaign_name):
+    """Post a campaign to the n8n audit webhook; raises if it isn't accepted"""
     script_url = "https://script.google.com/macros/s/AKfycbzRsWR8IfOAacu208nin_dlqTLLDRBZXhuVx6yUQ_BjsPrV6MVnlkZontzcWBPkjG4/exec"
-    campaign_name = get_campaign_name(campaign_id)
 
-    try:
-        app.logger.info(f"Triggering n8n for campaign: {campaign_name}")
-        response = requests.post(script_url, json={'campaign_name': campaign_name}, timeout=30)
+    app.logger.info(f"Triggering n8n for campaign: {campaign_name}")
+    response = requests.post(script_url, json={'campaign_name': campaign_name}, timeout=AUDIT_TIMEOUT)
 
-        if response.status_code == 200:
-            app.logger.info(f"Audit triggered for {campaign_name}")
-        else:
-            app.logger.error(f"Proxy error: {response.status_code} - {response.text}")
-    except Exception as e:
-        app.logger.error(f"Error triggering audit: {str(e)}")
-    finally:
-        time.sleep(10)
-        active_campaigns.pop(campaign_id, None)
+    if response.status_code != 200:
+        raise RuntimeError(f"Proxy error: {response.status_code} - {response.text}")
+    app.logger.info(f"Audit triggered for {campaign_name}")
 
-def compute_summary_data(campaign_id):
+def compute_summary_data(snapshot):
     """Compute summary data for a campaign"""
     try:
-        campaign_value = get_campaign_value(campaign_id) if campaign_id else None
+        snapshot.prefetch('active_influencers', 'posts')
 
         # Get active influencers
-        active_influencers = get_active_influencers()
+        active_influencers = snapshot.active_influencers
         active_tiktok_links = set(active_influencers.keys())
 
         # Get campaign posts
-        campaign_posts = get_campaign_posts(campaign_value)
+        campaign_posts = snapshot.posts
 
         # Initialize counters
         posts_with_issues = 0
@@ -291,7 +2847,7 @@ def compute_summary_data(campaign_id):
         # Process posts
         for post in campaign_posts:
             fields = post.get('fields', {})
-            tiktok_link = fields.get('TikTokLink', '').strip()
+            tiktok_link = normalize_profile_url(fields.get('TikTokLink'))
             post_flag = fields.get('ManualFlag')  # This is the field we check for manual review
 
             if tiktok_link:
@@ -319,6 +2875,9 @@ def compute_summary_data(campaign_id):
             "videos_for_manual_review": posts_for_manual_review,
         }
 
+    except AirtableUnavailable:
+        # Surface throttling as an error rather than an empty list
+        raise
     except Exception as e:
         app.logger.error(f"Error computing summary data: {str(e)}")
         return {
@@ -329,250 +2888,495 @@ def compute_summary_data(campaign_id):
             "videos_for_manual_review": 0,
         }
 
-def get_all_posts_without_issues(campaign_value):
-    """Get all posts without issues for the campaign"""
+def get_campaign_summary(campaign_id):
+    """(etag, summary) from the summary counters, or a full recount without an etag"""
     try:
-        # Get all posts for the campaign
-        posts = get_campaign_posts(campaign_value)
-
-        # Get posts with issues to exclude them
-        posts_with_issues = get_all_posts_with_issues(campaign_value)
-        issue_post_ids = {post['postId'] for post in posts_with_issues} if posts_with_issues else set()
-        influencers = tables['influencers'].get_all()
-        contact_map = {}
-        for inf in influencers:
-            name = inf['fields'].get('Name')
-            if name:
-                contact_map[name] = inf['fields'].get('ContactNumber', '')
+        return summary_counters.summary(campaign_id)
+    except AirtableUnavailable:
+        # Recounting would hit the same throttled API
+        raise
+    except Exception as e:
+        app.logger.error(f"Summary counters failed, recounting: {str(e)}")
+        return None, compute_summary_data(CampaignSnapshot(campaign_id, views=('summary',)))
 
-        results = []
+def collect_review_items(items, description):
+    """Build a review list from an item generator, returning [] on failure"""
+    try:
+        return list(items)
+    except AirtableUnavailable:
+        # Surface throttling as an error rather than an empty list
+        raise
+    except Exception as e:
+        app.logger.error(f"Error {description}: {str(e)}")
+        return []
 
-        # Get campaign name once for all posts
-        campaign_name = get_campaign_name_from_value(campaign_value)
+def iter_posts_without_issues(snapshot):
+    """Yield review items for posts without issues, in post order"""
+    # Get posts with issues to exclude them
+    issue_post_ids = {post['postId'] for post in snapshot.posts_with_issues}
 
-        for post in posts:
-            post_id = post['id']
-            fields = post.get('fields', {})
-            post_link = fields.get('PostLink', '')
+    # Get campaign name once for all posts
+    campaign_name = snapshot.campaign_name
 
+    # Airtable already applied this unless the request also reads the issues view
+    keep = POST_FILTERS['without_issues']
 
-            # Skip posts that have issues
-            if post_id in issue_post_ids:
-                continue
+    for post in snapshot.posts:
+        post_id = post['id']
+        fields = post.get('fields', {})
+        post_link = fields.get('PostLink', '')
 
-            # Only include posts with "All Correct" quality
-            quality = fields.get('PostQuality', '').strip()
-            if quality != 'All Correct' or not post_link:
-                continue
+        # Skip posts that have issues
+        if post_id in issue_post_ids:
+            continue
 
-            # Process influencer name
-            full_name = fields.get('InfluencerName', 'Unknown Influencer')
-            first_name = get_first_name(full_name)
-            contact_number = str(contact_map.get(full_name, ''))
-
-            suggested_message = format_suggested_message(first_name, campaign_name)
-
-            results.append({
-                'postId': post_id,
-                'influencerName': full_name,
-                'videoLink': post_link,
-                'issueCaption': None,
-                'suggestedMessage': suggested_message,
-                'hasIssues': False,
-                'currentRating': fields.get('manualRating', 0),
-                'currentFlag': fields.get('reviewFlag', ''),
-                'contactNumber': contact_number or '',
-                'type': 'combined'
-            })
+        # Only include "All Correct" posts with a link
+        if not keep.matches(fields):
+            continue
 
-        return results
-    except Exception as e:
-        app.logger.error(f"Error getting posts without issues: {str(e)}")
-        return []
+        # Process influencer name
+        full_name = fields.get('InfluencerName', 'Unknown Influencer')
+        first_name = get_first_name(full_name)
+        contact_number = influencer_directory.contact_number(full_name)
+
+        yield {
+            'postId': post_id,
+            'influencerName': full_name,
+            'videoLink': post_link,
+            'issueCaption': None,
+            # Rendered on demand via /suggested_message
+            'messageScenario': 'approved',
+            'messageFields': {'first_name': first_name, 'campaign_name': campaign_name},
+            'hasIssues': False,
+            'currentRating': fields.get('manualRating', 0),
+            'currentFlag': fields.get('reviewFlag', ''),
+            'contactNumber': contact_number or '',
+            'reviewed': fields.get('reviewed', False),
+            'approved_Status': fields.get('approved_Status', 'NO'),
+            'type': 'combined'
+        }
 
-def get_all_posts_with_issues(campaign_value):
-    """Get all posts with issues for the campaign"""
-    try:
-        # Group errors by post ID
-        all_errors = defaultdict(list)
-        for error in tables['errors'].get_all():
-            error_fields = error.get('fields', {})
-            for pid in ensure_list(error_fields.get('postId', [])):
-                all_errors[str(pid)].append(error_fields.get('errorDescription', 'Unknown error'))
-
-        # Get all posts for the campaign
-        posts = get_campaign_posts(campaign_value)
-
-        influencers = tables['influencers'].get_all()
-        contact_map = {}
-        for inf in influencers:
-            name = inf['fields'].get('Name')
-            if name:
-                contact_map[name] = inf['fields'].get('ContactNumber', '')
+def get_all_posts_without_issues(snapshot):
+    """Get all posts without issues for the campaign"""
+    return collect_review_items(iter_posts_without_issues(snapshot), "getting posts without issues")
 
-        # Create post ID mapping
-        post_id_to_record = {}
-        for post in posts:
-            fields = post.get('fields', {})
-            for field in ['PostID', 'ID', 'Post_ID', 'post_id', 'postId', 'id']:
-                if field in fields and fields[field]:
-                    post_id_to_record[str(fields[field])] = post
-                    break
+def iter_posts_with_issues(snapshot):
+    """Yield review items for posts with logged errors, one per post link"""
+    snapshot.prefetch('posts', 'influencers', 'errors', 'campaign_name')
 
-        results = []
-        processed_links = set()
+    # Errors grouped by post ID, already limited to this campaign's posts
+    all_errors = snapshot.errors
 
-        # Get campaign name once for all posts
-        campaign_name = get_campaign_name_from_value(campaign_value)
+    post_id_to_record = snapshot.post_id_to_record
 
-        for error_id, error_descriptions in all_errors.items():
-            if error_id not in post_id_to_record:
-                continue
+    processed_links = set()
 
-            post = post_id_to_record[error_id]
-            fields = post.get('fields', {})
-            post_link = fields.get('PostLink', '')
+    # Get campaign name once for all posts
+    campaign_name = snapshot.campaign_name
 
-            if post_link in processed_links:
-                continue
-            processed_links.add(post_link)
-
-            # Process influencer name
-            full_name = fields.get('InfluencerName', 'Unknown Influencer')
-            first_name = get_first_name(full_name)
-            contact_number = str(contact_map.get(full_name, ''))
-
-            # Process errors
-            all_hashtags = set()
-            all_tags = set()
-            for desc in error_descriptions:
-                hashtags, tags = parse_error_description(desc)
-                all_hashtags.update(hashtags)
-                all_tags.update(tags)
-
-            # Format message
-            error_parts = []
-            if all_hashtags:
-                error_parts.append(f"Missing Hashtags: {', '.join(sorted(all_hashtags))}")
-            if all_tags:
-                error_parts.append(f"Missing Tags: {', '.join(sorted(all_tags))}")
-
-            suggested_message = format_suggested_message(
-                first_name,
-                campaign_name,
-                error_parts
-            )
-
-            results.append({
-                'postId': post['id'],
-                'influencerName': full_name,
-                'videoLink': post_link or '#',
-                'issueCaption': "; ".join(error_parts) or "Please review your post",
-                'suggestedMessage': suggested_message,
-                'hasIssues': True,
-                'currentRating': fields.get('manualRating', 0),
-                'currentFlag': fields.get('reviewFlag', ''),
-                'contactNumber': contact_number or '',
-                'type': 'combined'
-            })
+    for error_id, (all_hashtags, all_tags) in all_errors.items():
+        if error_id not in post_id_to_record:
+            continue
 
-        return results
-    except Exception as e:
-        app.logger.error(f"Error getting posts with issues: {str(e)}")
-        return []
+        post = post_id_to_record[error_id]
+        fields = post.get('fields', {})
+        post_link = fields.get('PostLink', '')
 
-def get_all_posts_combined(campaign_value):
-    """Get all posts combined - issues first, then without issues"""
-    campaign_name = get_campaign_name_from_value(campaign_value)
-    posts_with_issues = get_all_posts_with_issues(campaign_value)
-    posts_without_issues = get_all_posts_without_issues(campaign_value)
-
-    # Combine with issues first
-    combined = posts_with_issues + posts_without_issues
-
-    # Add reviewed status and campaign name to each post
-    for post in combined:
-        post_record = get_record('posts', post.get('postId'))
-        if post_record:
-            fields = post_record.get('fields', {})
-            post['reviewed'] = fields.get('reviewed', False)
-            post['approved_Status'] = fields.get('approved_Status', 'NO')
-        # Add campaign name to each post
+        if post_link in processed_links:
+            continue
+        processed_links.add(post_link)
+
+        # Process influencer name
+        full_name = fields.get('InfluencerName', 'Unknown Influencer')
+        first_name = get_first_name(full_name)
+        contact_number = influencer_directory.contact_number(full_name)
+
+        # Format message
+        error_parts = []
+        if all_hashtags:
+            error_parts.append(f"Missing Hashtags: {', '.join(sorted(all_hashtags))}")
+        if all_tags:
+            error_parts.append(f"Missing Tags: {', '.join(sorted(all_tags))}")
+
+        yield {
+            'postId': post['id'],
+            'influencerName': full_name,
+            'videoLink': post_link or '#',
+            'issueCaption': "; ".join(error_parts) or "Please review your post",
+            # Rendered on demand via /suggested_message
+            'messageScenario': 'issues' if error_parts else 'approved',
+            'messageFields': {'first_name': first_name, 'campaign_name': campaign_name, 'issues': error_parts},
+            'hasIssues': True,
+            'currentRating': fields.get('manualRating', 0),
+            'currentFlag': fields.get('reviewFlag', ''),
+            'contactNumber': contact_number or '',
+            'reviewed': fields.get('reviewed', False),
+            'approved_Status': fields.get('approved_Status', 'NO'),
+            'type': 'combined'
+        }
+
+def get_all_posts_with_issues(snapshot):
+    """Get all posts with issues for the campaign"""
+    return collect_review_items(iter_posts_with_issues(snapshot), "getting posts with issues")
+
+def iter_posts_combined(snapshot):
+    """Yield posts with issues first, then posts without issues"""
+    campaign_name = snapshot.campaign_name
+
+    for post in snapshot.posts_with_issues:
+        # Copy so the snapshot's shared issue list isn't modified
+        yield {**post, 'campaignName': campaign_name}
+    for post in iter_posts_without_issues(snapshot):
         post['campaignName'] = campaign_name
+        yield post
 
-    return combined
+def get_all_posts_combined(snapshot):
+    """Get all posts combined - issues first, then without issues"""
+    return collect_review_items(iter_posts_combined(snapshot), "getting combined posts")
 
-def process_not_uploaded_review(campaign_value, campaign_id):
-    """Process influencers who haven't uploaded"""
-    try:
-        active_influencers = get_active_influencers()
-        campaign_posts = get_campaign_posts(campaign_value)
+def iter_not_uploaded_review(snapshot):
+    """Yield review items for active influencers without a post"""
+    snapshot.prefetch('active_influencers', 'posts', 'campaign_name')
 
-        # Get posted links
-        posted_links = set()
-        for post in campaign_posts:
-            fields = post.get('fields', {})
-            tiktok_link = fields.get('TikTokLink', '').strip()
-            if tiktok_link:
-                posted_links.add(tiktok_link)
+    active_influencers = snapshot.active_influencers
 
-        # Prepare results
-        results = []
+    # Get posted links, keyed the same way as the influencer directory
+    posted_links = set()
+    for post in snapshot.posts:
+        tiktok_link = normalize_profile_url(post.get('fields', {}).get('TikTokLink'))
+        if tiktok_link:
+            posted_links.add(tiktok_link)
 
-        # Get campaign name - try from value first, then from record ID
-        campaign_name = get_campaign_name_from_value(campaign_value)
-        if campaign_name.startswith('Campaign ') or not campaign_name:
-            # If we couldn't find it by value, try by record ID
-            campaign_name = get_campaign_name(campaign_id)
+    # Get campaign name - try from value first, then from record ID
+    campaign_name = snapshot.campaign_name
+    if campaign_name.startswith('Campaign ') or not campaign_name:
+        # If we couldn't find it by value, try by record ID
+        campaign_name = get_campaign_name(snapshot.campaign_id)
 
-        for tiktok_link, influencer in active_influencers.items():
-            if tiktok_link in posted_links:
-                continue
+    for link_key, influencer in active_influencers.items():
+        if link_key in posted_links:
+            continue
 
-            fields = influencer['fields']
-            full_name = fields.get('Name', 'Unknown Influencer')
-            first_name = get_first_name(full_name)
-            contact_number = str(fields.get('ContactNumber', ''))
-
-            results.append({
-                'influencerId': influencer['id'],
-                'influencerName': full_name,
-                'tiktokLink': tiktok_link,
-                'instagramLink': fields.get('InstagramLink', '#'),
-                'suggestedMessage': (
-                    f"Hi {first_name},\n"
-                    f"We noticed you haven't uploaded your video for {campaign_name} yet.\n"
-                    "Please upload it as soon as possible.\n"
-                    "Thanks!"
-                ),
-                'contactNumber': contact_number or '',
-                'type': 'not_uploaded'
-            })
+        fields = influencer['fields']
+        tiktok_link = fields.get('TiktokLink', '').strip()
+        full_name = fields.get('Name', 'Unknown Influencer')
+        first_name = get_first_name(full_name)
+        contact_number = str(fields.get('ContactNumber', ''))
+
+        yield {
+            'influencerId': influencer['id'],
+            'influencerName': full_name,
+            'tiktokLink': tiktok_link,
+            'instagramLink': fields.get('InstagramLink', '#'),
+            # Rendered on demand via /suggested_message
+            'messageScenario': 'not_uploaded',
+            'messageFields': {'first_name': first_name, 'campaign_name': campaign_name},
+            'contactNumber': contact_number or '',
+            'type': 'not_uploaded'
+        }
 
-        return results
-    except Exception as e:
-        app.logger.error(f"Error processing not uploaded: {str(e)}")
-        return []
+def process_not_uploaded_review(snapshot):
+    """Process influencers who haven't uploaded"""
+    return collect_review_items(iter_not_uploaded_review(snapshot), "processing not uploaded")
 
-def process_manual_review(campaign_value):
-    """Process posts needing manual review"""
-    try:
-        formula = f"{{PostQuality}}='Manual Review' AND {{CampaignId}}='{campaign_value}'" if campaign_value else "{PostQuality}='Manual Review'"
-        posts = tables['posts'].get_all(formula=formula)
+def iter_manual_review(snapshot):
+    """Yield review items for posts needing manual review"""
+    keep = POST_FILTERS['manual_review']
+    if snapshot.post_filter is keep:
+        posts = snapshot.posts
+    else:
+        posts = get_campaign_posts(snapshot.campaign_value, snapshot.projection.get('posts'), keep)
 
-        return [{
+    for post in posts:
+        yield {
             'postId': post['id'],
             'influencerName': post['fields'].get('InfluencerName', 'Unknown Influencer'),
             'videoLink': post['fields'].get('PostLink', '#'),
             'transcript': post['fields'].get('VideoTranscription', 'No transcript available'),
             'currentFlag': post['fields'].get('reviewFlag', ''),
             'type': 'manual_review'
-        } for post in posts]
-    except Exception as e:
-        app.logger.error(f"Error processing manual review: {str(e)}")
-        return []
+        }
 
+def process_manual_review(snapshot):
+    """Process posts needing manual review"""
+    return collect_review_items(iter_manual_review(snapshot), "processing manual review")
+
+
+# --- Request Profiling ---
+class StackSampler:
+    """Samples one thread's stack at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = defaultdict(int)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """One 'frame;frame;... count' line per stack, the input flamegraph.pl expects"""
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self.stacks.items()))
+
+class RequestProfile:
+    """cProfile and stack samples of the request thread while one request runs.
+
+    Work done on fetch pool threads shows up as time waiting on futures.
+    Only one request per worker is profiled at a time, since newer Pythons
+    allow a single active cProfile per interpreter.
+    """
+
+    _active = threading.Lock()
+
+    def __init__(self):
+        self.id = f"{os.getpid()}-{int(time.time() * 1000)}-{random.getrandbits(16):04x}"
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL)
+        self.started = time.time()
+        self._started = time.perf_counter()
+
+    def start(self):
+        """False if another request is being profiled"""
+        if not self._active.acquire(blocking=False):
+            return False
+        self.sampler.start()
+        self.profiler.enable()
+        return True
+
+    def abort(self):
+        self.profiler.disable()
+        self.sampler.stop()
+        self._active.release()
+
+    def stop(self, response):
+        self.abort()
+        self.profiler.create_stats()
+        return {
+            'id': self.id,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'started': self.started,
+            'seconds': round(time.perf_counter() - self._started, 4),
+            'samples': sum(self.sampler.stacks.values()),
+            # Same bytes cProfile.Profile.dump_stats writes; load with pstats.Stats(path)
+            'pstats': marshal.dumps(self.profiler.stats),
+            'collapsed': self.sampler.collapsed()
+        }
 
+class ProfileStore:
+    """The last few request profiles taken by this worker"""
+
+    def __init__(self, keep):
+        self._profiles = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id):
+        with self._lock:
+            return next((p for p in self._profiles if p['id'] == profile_id), None)
+
+    def list(self):
+        """Profiles newest first, without their payloads"""
+        with self._lock:
+            return [{k: v for k, v in p.items() if k not in ('pstats', 'collapsed')}
+                    for p in reversed(self._profiles)]
+
+profile_store = ProfileStore(PROFILE_KEEP)
+_request_profile = ContextVar('request_profile', default=None)
+
+def profiling_authorized():
+    """True if the request carries the profiling token"""
+    if not PROFILE_TOKEN:
+        return False
+    # Header only: a query string would leak the token into logs and Referer headers
+    token = request.headers.get('X-Profile-Token') or ''
+    return hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode())
+
+
+# --- Response Compression ---
+def negotiate_encoding():
+    """'br', 'gzip' or None, by the request's Accept-Encoding"""
+    accepted = request.accept_encodings
+    br = accepted.quality('br') if brotli is not None else 0
+    gz = accepted.quality('gzip')
+    if not br and not gz:
+        return None
+    return 'br' if br >= gz else 'gzip'
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, COMPRESS_GZIP_LEVEL)
+
+def compress_stream(chunks, encoding):
+    """Encode a streamed body, flushing after every chunk so lines still arrive as they are built"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        encode, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        encode, finish = compressor.compress, compressor.flush
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+    try:
+        for chunk in chunks:
+            yield encode(chunk.encode() if isinstance(chunk, str) else chunk) + flush()
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+# Registered before the other after_request hooks so that it runs last
+@app.after_request
+def compress_response(response):
+    """gzip or brotli encode the response if the client accepts it"""
+    if (request.method == 'HEAD' or response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The encoded body differs byte for byte; If-None-Match still matches weakly
+        response.set_etag(etag, weak=True)
+    return response
+
+
+# --- Request Hooks ---
+def metrics_endpoint():
+    """Endpoint label for the current request, e.g. get_review_data:issues"""
+    endpoint = request.endpoint or 'unmatched'
+    arg = METRICS_ENDPOINT_ARGS.get(endpoint)
+    if arg:
+        value = request.args.get(arg)
+        if not value:
+            value = 'none'
+        elif value not in METRICS_ENDPOINT_VALUES.get(endpoint, ()):
+            value = 'other'
+        endpoint = f"{endpoint}:{value}"
+    return endpoint
+
+def server_timing(stats, elapsed):
+    """Server-Timing header value: total, Airtable and per-table durations"""
+    totals = stats.totals()
+    entries = [f'app;dur={elapsed * 1000:.1f}',
+               f'airtable;dur={totals["seconds"] * 1000:.1f};desc="{totals["calls"]} calls, '
+               f'{totals["requests"]} requests"']
+    for table_name, counters in sorted(stats.per_table().items()):
+        entries.append(
+            f'at-{table_name};dur={counters["seconds"] * 1000:.1f};desc="calls={counters["calls"]} '
+            f'records={counters["records"]} hits={counters["cache_hits"]} misses={counters["cache_misses"]}"')
+    return ', '.join(entries)
+
+@app.before_request
+def start_airtable_call_count():
+    _request_airtable_stats.set(RequestAirtableStats())
+
+@app.before_request
+def start_request_profile():
+    """Profile this request if it asks to, unless it is fetching profiles"""
+    if request.endpoint in ('list_profiles', 'download_profile') or not profiling_authorized():
+        _request_profile.set(None)
+        return
+    profile = RequestProfile()
+    _request_profile.set(profile if profile.start() else None)
+
+@app.after_request
+def report_airtable_call_count(response):
+    """Expose the request's Airtable work in headers and add it to the endpoint totals.
+
+    Streamed responses are reported when their first chunk is ready, so
+    /metrics undercounts Airtable work done while the rest streams.
+    """
+    stats = _request_airtable_stats.get()
+    if stats is None:
+        return response
+    elapsed = time.perf_counter() - stats.started
+    per_table = stats.per_table()
+    totals = stats.totals()
+    response.headers['X-Airtable-Calls'] = str(totals['calls'])
+    response.headers['Server-Timing'] = server_timing(stats, elapsed)
+
+    endpoint = metrics_endpoint()
+    with _endpoint_calls_lock:
+        calls = endpoint_airtable_calls[endpoint]
+        calls['requests'] += 1
+        calls['airtable_calls'] += totals['calls']
+        for table_name, counters in per_table.items():
+            calls['tables'][table_name] += counters['calls']
+
+    metrics.inc('app_requests_total', {'endpoint': endpoint, 'status': str(response.status_code)})
+    metrics.observe('app_request_duration_seconds', {'endpoint': endpoint}, elapsed)
+    metrics.observe('airtable_calls_per_request', {'endpoint': endpoint}, totals['calls'])
+    metrics.observe('airtable_seconds_per_request', {'endpoint': endpoint}, totals['seconds'])
+    for table_name, counters in per_table.items():
+        for counter, (name, _) in AIRTABLE_METRICS.items():
+            if counters[counter]:
+                metrics.inc(name, {'endpoint': endpoint, 'table': table_name}, counters[counter])
+
+    if totals['calls']:
+        calls_per_table = {name: counters['calls'] for name, counters in per_table.items() if counters['calls']}
+        app.logger.info(f"{endpoint}: {totals['calls']} Airtable calls {calls_per_table}")
+    return response
+
+@app.after_request
+def finish_request_profile(response):
+    """Store the request's profile and point the caller at it.
+
+    A streamed response is profiled up to its first chunk.
+    """
+    profile = _request_profile.get()
+    if profile is None:
+        return response
+    _request_profile.set(None)
+    result = profile.stop(response)
+    profile_store.add(result)
+    response.headers['X-Profile-Id'] = result['id']
+    app.logger.info(f"Profiled {result['path']} in {result['seconds']}s as {result['id']}")
+    return response
+
+@app.teardown_request
+def discard_request_profile(error=None):
+    """Stop a profile left running by a request that raised"""
+    profile = _request_profile.get()
+    if profile is not None:
+        _request_profile.set(None)
+        profile.abort()
 
 # --- New Routes ---
 @app.route('/save_flag', methods=['POST'])
@@ -587,7 +3391,7 @@ def save_flag():
             return jsonify({"error": "Missing postId or flag"}), 400
 
         # Update the post record in Airtable
-        tables['posts'].update(post_id, {'ManualFlag': flag})
+        post_updates.submit(post_id, {'ManualFlag': flag}).result(timeout=WRITE_TIMEOUT)
 
         app.logger.info(f"Flag saved: Post {post_id} flagged as {flag}")
         return jsonify({"status": "success", "message": "Flag saved successfully"})
@@ -611,7 +3415,7 @@ def save_rating():
             return jsonify({"error": "Rating must be between 1 and 5"}), 400
 
         # Update the post record in Airtable
-        tables['posts'].update(post_id, {'manualRating': rating})
+        post_updates.submit(post_id, {'manualRating': rating}).result(timeout=WRITE_TIMEOUT)
 
         app.logger.info(f"Rating saved: Post {post_id} rated {rating}")
         return jsonify({"status": "success", "message": "Rating saved successfully"})
@@ -619,6 +3423,61 @@ def save_rating():
         app.logger.error(f"Rating error: {str(e)}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/batch_update', methods=['POST'])
+def batch_update():
+    """Save several review edits in one request.
+
+    Body: {"updates": [{"postId": ..., "flag"/"rating"/"reviewed"/"status"/"comment": ...}]}
+    Edits are merged per post and written in batched PATCHes; the response
+    carries one result per update, in request order.
+    """
+    try:
+        data = request.json or {}
+        updates = data.get('updates')
+        if not isinstance(updates, list) or not updates:
+            return jsonify({"error": "Missing updates"}), 400
+
+        results = []
+        pending = []
+        for update in updates:
+            post_id = update.get('postId') if isinstance(update, dict) else None
+            fields = {field: update[key] for key, field in REVIEW_EDIT_FIELDS.items()
+                      if isinstance(update, dict) and update.get(key) is not None}
+            error = None
+            if not post_id:
+                error = "Missing postId"
+            elif not fields:
+                error = "No fields to update"
+            elif 'manualRating' in fields and (
+                    not isinstance(fields['manualRating'], int) or not 1 <= fields['manualRating'] <= 5):
+                error = "Rating must be between 1 and 5"
+            result = {'postId': post_id}
+            if error:
+                result.update(status='error', message=error)
+            else:
+                pending.append((result, post_updates.submit(post_id, fields)))
+            results.append(result)
+
+        for result, future in pending:
+            try:
+                future.result(timeout=WRITE_TIMEOUT)
+                result['status'] = 'success'
+            except Exception as e:
+                result.update(status='error', message=str(e))
+
+        failed = sum(1 for result in results if result['status'] != 'success')
+        app.logger.info(f"Batch update: {len(results) - failed} saved, {failed} failed")
+        status = 'success' if not failed else ('error' if failed == len(results) else 'partial')
+        return jsonify({"status": status, "results": results})
+    except Exception as e:
+        app.logger.error(f"Batch update error: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/write_queue_stats')
+def write_queue_stats():
+    """Write queue coalescing and batching counters"""
+    return jsonify(post_updates.stats())
+
 @app.route('/log_message', methods=['POST'])
 def log_message():
     """Log message sending activity"""
@@ -649,14 +3508,18 @@ def summary_page():
         return "Airtable connection error", 500
 
     try:
-        summary_data = compute_summary_data(campaign_id)
+        summary_data = get_campaign_summary(campaign_id)[1]
         return render_template(
             'index.html',
             summary_data=summary_data,
             campaign_id=campaign_id,
             campaign_name=campaign_name,
-            active_campaigns=active_campaigns
+            active_campaigns=active_audits(),
+            live_events=EVENTS_ENABLED
         )
+    except AirtableUnavailable as e:
+        app.logger.error(f"Summary error: {str(e)}")
+        return "Airtable is busy, please try again shortly", 503
     except Exception as e:
         app.logger.error(f"Summary error: {str(e)}")
         return f"Server Error: {str(e)}", 500
@@ -668,7 +3531,7 @@ def campaign_select():
         return "Airtable connection error", 500
 
     try:
-        campaigns = tables['campaigns'].get_all()
+        campaigns = campaign_directory.records()
         campaign_list = [{
             'id': c['id'],
             'name': c['fields'].get('campaignName', 'Unnamed Campaign')
@@ -690,7 +3553,7 @@ def mark_reviewed():
         if not post_id:
             return jsonify({"error": "Missing postId"}), 400
 
-        tables['posts'].update(post_id, {'reviewed': reviewed})
+        post_updates.submit(post_id, {'reviewed': reviewed}).result(timeout=WRITE_TIMEOUT)
         app.logger.info(f"Review status saved: Post {post_id} - {reviewed}")
         return jsonify({"status": "success", "message": "Review status saved"})
     except Exception as e:
@@ -708,7 +3571,7 @@ def approve_post():
         if not post_id or not status:
             return jsonify({"error": "Missing postId or status"}), 400
 
-        tables['posts'].update(post_id, {'approved_Status': status})
+        post_updates.submit(post_id, {'approved_Status': status}).result(timeout=WRITE_TIMEOUT)
         app.logger.info(f"Approval status saved: Post {post_id} - {status}")
         return jsonify({"status": "success", "message": "Approval status saved"})
     except Exception as e:
@@ -723,65 +3586,456 @@ def start_audit():
         return jsonify({'error': 'Missing campaign_id'}), 400
 
     campaign_name = get_campaign_name(campaign_id)
-    thread = threading.Thread(target=trigger_n8n_audit, args=(campaign_id,))
-    thread.daemon = True
-    thread.start()
+    job, created = audit_scheduler.submit(campaign_id, campaign_name)
 
-    active_campaigns[campaign_id] = True
     return jsonify({
         "status": "success",
-        "message": f"Audit started for campaign: {campaign_name}",
+        "message": f"Audit {'started' if created else 'already in progress'} for campaign: {campaign_name}",
+        "job": job,
         "redirect_url": url_for('summary_page', campaign_id=campaign_id)
     })
 
 @app.route('/audit_status')
 def audit_status():
-    return jsonify({'active_audits': list(active_campaigns.keys())})
+    return jsonify({'active_audits': active_audits()})
+
+@app.route('/audit_jobs')
+def audit_jobs():
+    """Recent audit jobs, newest first; ?campaign_id= for one campaign"""
+    return jsonify(audit_scheduler.jobs(request.args.get('campaign_id')))
+
+@app.route('/audit_jobs/<job_id>')
+def audit_job(job_id):
+    """State and timings of one audit job"""
+    job = audit_scheduler.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
+@app.route('/events')
+def events():
+    """Server-sent events for one campaign: 'summary' and 'audit' changes.
+
+    The stream opens with the current state of both, then carries changes
+    as they happen. It closes after EVENTS_MAX_STREAM_SECONDS and the
+    browser's EventSource reconnects. 404 unless EVENTS_ENABLED.
+    """
+    if not EVENTS_ENABLED:
+        return jsonify({'error': 'Event stream disabled'}), 404
+    campaign_id = request.args.get('campaign_id', '')
+
+    def generate():
+        # Subscribe before reading the current state so no change falls in between
+        q = event_broker.subscribe(campaign_id)
+        try:
+            yield f"retry: {EVENTS_KEEPALIVE * 1000}\n\n"
+            try:
+                yield format_sse('summary', get_campaign_summary(campaign_id)[1])
+            except Exception as e:
+                app.logger.error(f"Event stream error: {str(e)}")
+            yield format_sse('audit', {'active': is_audit_active(campaign_id)})
+            deadline = time.monotonic() + EVENTS_MAX_STREAM_SECONDS
+            while time.monotonic() < deadline:
+                try:
+                    yield q.get(timeout=EVENTS_KEEPALIVE)
+                except queue.Empty:
+                    if not event_broker.is_subscribed(campaign_id, q):
+                        break
+                    yield ": keepalive\n\n"
+        finally:
+            event_broker.unsubscribe(campaign_id, q)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/event_stats')
+def event_stats():
+    """Open event streams per campaign and events sent"""
+    return jsonify(event_broker.stats())
+
+# Projections each review type needs; combined runs both post builders
+REVIEW_VIEWS = {
+    'combined': ('issues', 'without_issues'),
+    'issues': ('issues',),
+    'not_uploaded': ('not_uploaded',),
+    'manual_review': ('manual_review',)
+}
+
+# Item generator for each review type
+REVIEW_BUILDERS = {
+    'combined': iter_posts_combined,
+    'issues': iter_posts_with_issues,
+    'not_uploaded': iter_not_uploaded_review,
+    'manual_review': iter_manual_review
+}
+
+# Argument values that get their own /metrics series; anything else a client
+# sends is counted as 'other' so it can't grow the registry
+METRICS_ENDPOINT_VALUES = {'get_review_data': frozenset(REVIEW_BUILDERS)}
+
+def json_bytes(value):
+    """Compact JSON, via orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode()
+
+def pack_review_items(items):
+    """Columnar form of review items: {"shared": {...}, "columns": [...], "rows": [[...]]}.
+
+    One level of nested objects (messageFields) is flattened into dotted
+    columns. A column with the same value in every item, such as
+    campaignName or type, is sent once in shared instead of in each row;
+    keys an item lacks come back as null. unpackReviewItems in script.js
+    reverses this.
+    """
+    flat = []
+    for item in items:
+        row = {}
+        for key, value in item.items():
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    row[f'{key}.{sub_key}'] = sub_value
+            else:
+                row[key] = value
+        flat.append(row)
+
+    columns = list(dict.fromkeys(key for row in flat for key in row))
+    missing = object()
+    shared = {}
+    for column in columns if flat else ():
+        first = flat[0].get(column, missing)
+        if first is not missing and all(row.get(column, missing) == first for row in flat):
+            shared[column] = first
+    columns = [column for column in columns if column not in shared]
+    return {'shared': shared, 'columns': columns,
+            'rows': [[row.get(column) for column in columns] for row in flat]}
+
+def review_item_key(item):
+    """Stable key of a review item: its post record ID, or influencer record ID for not_uploaded"""
+    return item.get('postId') or item.get('influencerId')
+
+def encode_review_cursor(review_type, last_item, offset):
+    """Opaque cursor for the page after last_item, which ended at offset"""
+    payload = json.dumps({'type': review_type, 'after': review_item_key(last_item), 'offset': offset},
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_review_cursor(cursor, review_type):
+    """(key of the last item sent, offset) from a cursor; ValueError if it is
+    malformed or for another type"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = int(payload['offset'])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get('type') != review_type or offset < 0:
+        raise ValueError("Invalid cursor")
+    return payload.get('after'), offset
+
+def resume_review_items(items, after, offset):
+    """(iterator over the items following the one keyed after, its position).
+
+    Resuming from a record ID keeps pages from shifting when items are added
+    or removed ahead of the cursor. If that item has left the list since,
+    fall back to its old position; pages can then skip or repeat an item.
+    """
+    items = iter(items)
+    if after is None:
+        return islice(items, offset, None), offset
+    seen = []
+    for item in items:
+        if review_item_key(item) == after:
+            return items, len(seen) + 1
+        seen.append(item)
+    return iter(seen[offset:]), offset
+
+def stream_review_items(items):
+    """NDJSON response: one item per line, written as each item is built.
+
+    The first item is built before the response starts so that Airtable
+    failures still get a proper status code; a failure after that is sent
+    as a final {"error": ...} line.
+    """
+    first = next(items, None)
+
+    def generate():
+        if first is None:
+            return
+        yield json_bytes(first) + b'\n'
+        try:
+            for item in items:
+                yield json_bytes(item) + b'\n'
+        except Exception as e:
+            app.logger.error(f"Review stream error: {str(e)}")
+            yield json_bytes({'error': str(e)}) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
 
 @app.route('/get_review_data')
 def get_review_data():
-    """Endpoint for review data"""
+    """Endpoint for review data.
+
+    Returns the full list by default. ?limit=N (with ?cursor= from the
+    previous page) returns {"items": [...], "next_cursor": ...} instead;
+    ?format=ndjson streams every item as it is built, and ?format=compact
+    returns the items packed by pack_review_items. Items carry message
+    fields for /suggested_message; ?messages=1 renders suggestedMessage
+    into every item instead.
+    """
     review_type = request.args.get('type')
     campaign_id = request.args.get('campaign_id', '')
-
-    # Safely get campaign_value
-    try:
-        campaign_value = get_campaign_value(campaign_id) if campaign_id else ''
-    except Exception as e:
-        app.logger.error(f"Error getting campaign value: {str(e)}")
-        campaign_value = ''
+    snapshot = CampaignSnapshot(campaign_id, views=REVIEW_VIEWS.get(review_type, ()))
 
     if not tables:
         return jsonify({'error': 'Airtable connection failed'}), 500
 
+    builder = REVIEW_BUILDERS.get(review_type)
+    if builder is None:
+        return jsonify({'error': 'Invalid review type'}), 400
+
+    def items():
+        built = builder(snapshot)
+        if request.args.get('messages'):
+            return map(with_suggested_message, built)
+        return built
+
+    compact = request.args.get('format') == 'compact'
     try:
-        if review_type == 'combined':
-            results = get_all_posts_combined(campaign_value)
-        elif review_type == 'issues':
-            results = get_all_posts_with_issues(campaign_value)
-        elif review_type == 'not_uploaded':
-            results = process_not_uploaded_review(campaign_value, campaign_id)
-        elif review_type == 'manual_review':
-            results = process_manual_review(campaign_value)
-        else:
-            return jsonify({'error': 'Invalid review type'}), 400
+        if request.args.get('format') == 'ndjson':
+            return stream_review_items(items())
 
-        return jsonify(results)
+        if 'limit' in request.args or 'cursor' in request.args:
+            try:
+                limit = min(int(request.args.get('limit', REVIEW_PAGE_MAX_LIMIT)), REVIEW_PAGE_MAX_LIMIT)
+                cursor = request.args.get('cursor')
+                after, offset = decode_review_cursor(cursor, review_type) if cursor else (None, 0)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if limit < 1:
+                return jsonify({'error': 'limit must be at least 1'}), 400
+
+            # Build one item past the page to know whether another page follows
+            remaining, offset = resume_review_items(items(), after, offset)
+            page = list(islice(remaining, limit + 1))
+            next_cursor = None
+            if len(page) > limit:
+                next_cursor = encode_review_cursor(review_type, page[limit - 1], offset + limit)
+            if compact:
+                payload = {**pack_review_items(page[:limit]), 'next_cursor': next_cursor}
+                return Response(json_bytes(payload), mimetype='application/json')
+            return jsonify({'items': page[:limit], 'next_cursor': next_cursor})
+
+        review_items = collect_review_items(items(), f"building {review_type} review data")
+        if compact:
+            return Response(json_bytes(pack_review_items(review_items)), mimetype='application/json')
+        return jsonify(review_items)
+    except AirtableUnavailable as e:
+        app.logger.error(f"Review data error: {str(e)}")
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         app.logger.error(f"Review data error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/suggested_message', methods=['POST'])
+def suggested_message():
+    """Render one suggested message.
+
+    Body: {"scenario": ..., "fields": {...}} as carried by a review item
+    (messageScenario / messageFields); "flag" switches to that flag's
+    scenario, and fields may add "post_link" (the review UI sends it with
+    flag messages only, as before; other messages say "your post").
+    """
+    data = request.json or {}
+    scenario = FLAG_MESSAGE_SCENARIOS.get(data.get('flag')) or data.get('scenario')
+    fields = data.get('fields') or {}
+    if scenario not in COMPILED_MESSAGE_TEMPLATES:
+        return jsonify({'error': 'Unknown message scenario'}), 400
+    if not isinstance(fields, dict):
+        return jsonify({'error': 'fields must be an object'}), 400
+
+    issues = fields.get('issues') or []
+    message = render_message(
+        scenario,
+        first_name=str(fields.get('first_name') or ''),
+        campaign_name=str(fields.get('campaign_name') or ''),
+        issues=[str(issue) for issue in issues] if isinstance(issues, list) else [str(issues)],
+        post_link=fields.get('post_link')
+    )
+    return jsonify({'scenario': scenario, 'message': message})
+
 @app.route('/get_summary_data')
 def get_summary_data():
     """Endpoint for summary data"""
     campaign_id = request.args.get('campaign_id', '')
     try:
-        summary_data = compute_summary_data(campaign_id)
-        return jsonify(summary_data)
+        etag, summary_data = get_campaign_summary(campaign_id)
+        response = jsonify(summary_data)
+        if etag:
+            # Pollers revalidate with If-None-Match and get a bodiless 304
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response.make_conditional(request)
+        return response
+    except AirtableUnavailable as e:
+        app.logger.error(f"Summary data error: {str(e)}")
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         app.logger.error(f"Summary data error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/portfolio_data')
+def portfolio_data():
+    """Summary metrics for every campaign, counted from one pass over the posts"""
+    try:
+        etag, rows = summary_counters.portfolio()
+        response = jsonify({'campaigns': rows})
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    except AirtableUnavailable as e:
+        app.logger.error(f"Portfolio data error: {str(e)}")
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        app.logger.error(f"Portfolio data error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/summary_stats')
+def summary_stats():
+    """Summary counter builds, delta refreshes and per-campaign versions"""
+    return jsonify(summary_counters.stats())
+
+@app.route('/healthz')
+def healthz():
+    """Liveness and readiness: 200 while warming up or ready, 503 if degraded"""
+    if not tables:
+        status = 'degraded'
+    elif warmup_status['state'] in ('pending', 'running'):
+        status = 'warming'
+    elif warmup_status['state'] == 'retrying':
+        status = 'degraded'
+    else:
+        status = 'ok'
+    return jsonify({
+        'status': status,
+        'ready': status == 'ok',
+        'airtable_configured': bool(tables),
+        'warmup': warmup_status,
+        'mirror': {'enabled': airtable_mirror is not None,
+                   'ready': airtable_mirror is not None and airtable_mirror.ready}
+    }), 503 if status == 'degraded' else 200
+
+@app.route('/cache_stats')
+def cache_stats():
+    """Airtable read cache statistics"""
+    return jsonify(airtable_cache.stats())
+
+@app.route('/campaign_error_stats')
+def campaign_error_stats():
+    """Most often missing hashtags and tags in a campaign's error log; ?limit= (default 10)"""
+    campaign_id = request.args.get('campaign_id', '')
+    if not tables:
+        return jsonify({'error': 'Airtable connection failed'}), 500
+    try:
+        limit = max(1, int(request.args.get('limit', 10)))
+    except ValueError:
+        return jsonify({'error': 'limit must be a number'}), 400
+
+    try:
+        snapshot = CampaignSnapshot(campaign_id, views=('error_stats',))
+        snapshot.prefetch('posts', 'errors')
+        stats = error_index.campaign_stats(
+            snapshot.campaign_value, snapshot.post_id_to_record.keys(), limit=limit)
+        return jsonify({
+            'campaign_id': campaign_id,
+            'campaign_name': snapshot.campaign_name,
+            **stats
+        })
+    except AirtableUnavailable as e:
+        app.logger.error(f"Campaign error stats error: {str(e)}")
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        app.logger.error(f"Campaign error stats error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/error_index_stats')
+def error_index_stats():
+    """Error log index size and refresh watermark"""
+    return jsonify(error_index.stats())
+
+@app.route('/campaign_directory')
+def campaign_directory_status():
+    """Campaign directory size and age; ?refresh=1 reloads it now"""
+    if request.args.get('refresh'):
+        try:
+            campaign_directory.refresh()
+        except Exception as e:
+            # Throttled or unreachable, the directory can't be reloaded right now
+            app.logger.error(f"Campaign directory refresh error: {str(e)}")
+            return jsonify({'error': str(e)}), 503
+    return jsonify(campaign_directory.stats())
+
+@app.route('/influencer_directory')
+def influencer_directory_status():
+    """Influencer directory size, keys per index and age; ?refresh=1 refreshes it now"""
+    if request.args.get('refresh'):
+        try:
+            influencer_directory.refresh(force=True)
+        except Exception as e:
+            app.logger.error(f"Influencer directory refresh error: {str(e)}")
+            return jsonify({'error': str(e)}), 503
+    return jsonify(influencer_directory.stats())
+
+@app.route('/mirror_status')
+def mirror_status():
+    """Local mirror sync state"""
+    if airtable_mirror is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **airtable_mirror.stats()})
+
+@app.route('/transport_stats')
+def transport_stats():
+    """Airtable HTTP requests, throttles, retries and failures since startup"""
+    return jsonify(airtable_transport.stats())
+
+@app.route('/airtable_calls')
+def airtable_calls():
+    """Airtable API calls made by each endpoint since startup"""
+    with _endpoint_calls_lock:
+        return jsonify({endpoint: {
+            'requests': stats['requests'],
+            'airtable_calls': stats['airtable_calls'],
+            'avg_calls_per_request': round(stats['airtable_calls'] / stats['requests'], 2),
+            'tables': dict(stats['tables'])
+        } for endpoint, stats in endpoint_airtable_calls.items()})
+
+@app.route('/metrics')
+def metrics_page():
+    """Request and per-table Airtable metrics in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/profiles')
+def list_profiles():
+    """Request profiles kept by this worker, newest first"""
+    if not profiling_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(profile_store.list())
+
+@app.route('/profiles/<profile_id>.<fmt>')
+def download_profile(profile_id, fmt):
+    """One profile as a pstats file or collapsed stacks for flame graphs"""
+    if not profiling_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    profile = profile_store.get(profile_id)
+    if profile is None or fmt not in ('pstats', 'collapsed'):
+        return jsonify({'error': 'Unknown profile'}), 404
+    if fmt == 'pstats':
+        body, mimetype = profile['pstats'], 'application/octet-stream'
+    else:
+        body, mimetype = profile['collapsed'], 'text/plain'
+    return Response(body, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{profile_id}.{fmt}"'})
+
 @app.route('/send_message', methods=['POST'])
 def send_message():
     """Handle message sending with contact number"""
@@ -821,7 +4075,7 @@ def save_comment():
             return jsonify({"error": "Missing data"}), 400
 
         # Update the post record in Airtable
-        tables['posts'].update(post_id, {'managerComment': comment})
+        post_updates.submit(post_id, {'managerComment': comment}).result(timeout=WRITE_TIMEOUT)
 
         app.logger.info(f"Comment saved for post {post_id}: {comment}")
         return jsonify({"status": "success", "message": "Comment saved"})
@@ -0,0 +1,582 @@
+"""Local stand-in for the Airtable REST API, seeded with synthetic campaigns.
+
+Serves /v0/<base>/<table> the way app.py uses it: paginated reads with
+fields[], filterByFormula, pageSize and maxRecords, single and batch
+writes, optional latency per request and 429s above a request rate.
+Point the app at it with AIRTABLE_API_URL=http://127.0.0.1:<port>/v0.
+
+    python bench/fake_airtable.py --posts 10000 --latency 0.2 --rate-limit 5
+
+GET /__bench/stats returns request, byte and throttle counters;
+POST /__bench/reset zeroes them.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Columns each table accepts; reads and writes naming anything else get a 422
+SCHEMAS = {
+    'campaignTable': {'CampaignID', 'campaignName'},
+    'influencerTable': {'Name', 'Active', 'TiktokLink', 'InstagramLink', 'ContactNumber'},
+    'postTable': {'PostID', 'CampaignId', 'TikTokLink', 'PostLink', 'PostQuality', 'InfluencerName',
+                  'VideoTranscription', 'ManualFlag', 'manualRating', 'reviewFlag', 'reviewed',
+                  'approved_Status', 'managerComment'},
+    'contentErrorLogTable': {'postId', 'errorDescription'}
+}
+
+PAGE_SIZE = 100
+MAX_RECORDS_PER_WRITE = 10
+
+QUALITIES = ['All Correct', 'Partially Correct/Incorrect', 'Manual Review']
+QUALITY_WEIGHTS = [0.5, 0.35, 0.15]
+ERROR_DESCRIPTIONS = [
+    'Partially Correct/Incorrect - Missing Hashtags: #ad, #sponsored',
+    'Partially Correct/Incorrect - Missing Tags: @brand',
+    'Partially Correct/Incorrect - Missing Hashtags: #ad - Missing Tags: @brand, @brandsa',
+    'Partially Correct/Incorrect - Missing Hashtags: #brandchallenge'
+]
+WORDS = ['today', 'we', 'are', 'trying', 'the', 'new', 'product', 'and', 'honestly', 'it', 'works',
+         'so', 'well', 'link', 'in', 'bio', 'use', 'my', 'code', 'for', 'a', 'discount']
+
+
+class FormulaError(ValueError):
+    """filterByFormula that Airtable would reject with INVALID_FILTER_BY_FORMULA"""
+
+
+# --- Formulas ---
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    | (?P<number>\d+(?:\.\d+)?)
+    | (?P<field>\{[^}]*\})
+    | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<op><=|>=|!=|[=<>&(),])
+    )""", re.VERBOSE)
+
+
+def _tokenize(formula):
+    tokens, pos = [], 0
+    formula = formula.rstrip()
+    while pos < len(formula):
+        match = _TOKEN.match(formula, pos)
+        if not match:
+            raise FormulaError(f'Unexpected character at {pos}: {formula[pos:pos + 10]!r}')
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'string':
+            text = re.sub(r'\\(.)', r'\1', text[1:-1])
+        elif kind == 'field':
+            text = text[1:-1]
+        tokens.append((kind, text))
+        pos = match.end()
+    return tokens
+
+
+def _text(value):
+    """A field value as Airtable formulas see it when compared as text"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, list):
+        return ', '.join(_text(v) for v in value)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _datetime(value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(_text(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _compare(op, left, right):
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        a, b = left, right
+    elif isinstance(left, datetime) or isinstance(right, datetime):
+        a, b = _datetime(left), _datetime(right)
+        if a is None or b is None:
+            return False
+    else:
+        a, b = _text(left), _text(right)
+    return {'=': a == b, '!=': a != b, '<': a < b, '>': a > b, '<=': a <= b, '>=': a >= b}[op]
+
+
+def _truthy(value):
+    if isinstance(value, str):
+        return value != ''
+    if isinstance(value, list):
+        return bool(value)
+    return bool(value)
+
+
+FUNCTIONS = {
+    'AND': lambda *args: all(_truthy(a) for a in args),
+    'OR': lambda *args: any(_truthy(a) for a in args),
+    'NOT': lambda value: not _truthy(value),
+    'IF': lambda cond, then, otherwise='': then if _truthy(cond) else otherwise,
+    'TRUE': lambda: True,
+    'FALSE': lambda: False,
+    'BLANK': lambda: None,
+    'LOWER': lambda value: _text(value).lower(),
+    'UPPER': lambda value: _text(value).upper(),
+    'TRIM': lambda value: _text(value).strip(),
+    'LEN': lambda value: len(_text(value)),
+    'FIND': lambda needle, haystack: _text(haystack).find(_text(needle)) + 1,
+    'SEARCH': lambda needle, haystack: _text(haystack).lower().find(_text(needle).lower()) + 1,
+    'ARRAYJOIN': lambda values, sep=', ': sep.join(_text(v) for v in (values or [])) if isinstance(values, list) else _text(values),
+    'IS_AFTER': lambda a, b: _compare('>', _datetime(a) or '', _datetime(b) or ''),
+    'IS_BEFORE': lambda a, b: _compare('<', _datetime(a) or '', _datetime(b) or ''),
+}
+# Functions of the record itself rather than of their arguments
+RECORD_FUNCTIONS = {
+    'RECORD_ID': lambda record: record['id'],
+    'CREATED_TIME': lambda record: _datetime(record['createdTime']),
+    'LAST_MODIFIED_TIME': lambda record: _datetime(record['_modified'])
+}
+
+
+class _Parser:
+    """Compiles a formula into a function of one record"""
+
+    def __init__(self, formula):
+        self.tokens = _tokenize(formula)
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self, text=None):
+        kind, value = self._peek()
+        if kind is None or (text is not None and value != text):
+            raise FormulaError(f'Expected {text or "a value"} at token {self.pos}')
+        self.pos += 1
+        return kind, value
+
+    def compile(self):
+        if not self.tokens:
+            return lambda record: True
+        expr = self._comparison()
+        if self.pos != len(self.tokens):
+            raise FormulaError(f'Unexpected {self.tokens[self.pos][1]!r} at token {self.pos}')
+        return expr
+
+    def _comparison(self):
+        left = self._concat()
+        while self._peek()[1] in ('=', '!=', '<', '>', '<=', '>='):
+            op = self._take()[1]
+            right = self._concat()
+            left = (lambda op, l, r: lambda record: _compare(op, l(record), r(record)))(op, left, right)
+        return left
+
+    def _concat(self):
+        left = self._primary()
+        while self._peek()[1] == '&':
+            self._take('&')
+            right = self._primary()
+            left = (lambda l, r: lambda record: _text(l(record)) + _text(r(record)))(left, right)
+        return left
+
+    def _primary(self):
+        kind, value = self._take()
+        if kind == 'string':
+            return lambda record: value
+        if kind == 'number':
+            number = float(value) if '.' in value else int(value)
+            return lambda record: number
+        if kind == 'field':
+            return lambda record: record['fields'].get(value)
+        if value == '(':
+            expr = self._comparison()
+            self._take(')')
+            return expr
+        if kind == 'name':
+            return self._call(value.upper())
+        raise FormulaError(f'Unexpected {value!r} at token {self.pos - 1}')
+
+    def _call(self, name):
+        if name not in FUNCTIONS and name not in RECORD_FUNCTIONS:
+            raise FormulaError(f'Unknown function {name}')
+        self._take('(')
+        args = []
+        if self._peek()[1] != ')':
+            args.append(self._comparison())
+            while self._peek()[1] == ',':
+                self._take(',')
+                args.append(self._comparison())
+        self._take(')')
+        if name in RECORD_FUNCTIONS:
+            fn = RECORD_FUNCTIONS[name]
+            return lambda record: fn(record)
+        fn = FUNCTIONS[name]
+        return lambda record: fn(*(arg(record) for arg in args))
+
+
+def compile_formula(formula):
+    """filterByFormula -> predicate over records; FormulaError if Airtable would reject it"""
+    compiled = _Parser(formula or '').compile()
+    return lambda record: _truthy(compiled(record))
+
+
+# --- Data ---
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+class FakeBase:
+    """In-memory tables keyed by name, each an insertion-ordered {record ID: record}"""
+
+    def __init__(self):
+        self.tables = {name: {} for name in SCHEMAS}
+        self._ids = 0
+        self._lock = threading.Lock()
+
+    def _new_id(self):
+        self._ids += 1
+        return f'rec{self._ids:014d}'
+
+    def add(self, table_name, fields, created=None):
+        with self._lock:
+            record_id = self._new_id()
+            stamp = _iso(created or time.time())
+            self.tables[table_name][record_id] = {
+                'id': record_id, 'createdTime': stamp, '_modified': stamp,
+                'fields': {k: v for k, v in fields.items() if v not in (None, '', [])}
+            }
+            return self.public(self.tables[table_name][record_id])
+
+    def update(self, table_name, record_id, fields, replace=False):
+        with self._lock:
+            record = self.tables[table_name].get(record_id)
+            if record is None:
+                return None
+            current = {} if replace else record['fields']
+            current.update(fields)
+            record['fields'] = {k: v for k, v in current.items() if v not in (None, '', [])}
+            record['_modified'] = _iso(time.time())
+            return self.public(record)
+
+    def delete(self, table_name, record_id):
+        with self._lock:
+            return self.tables[table_name].pop(record_id, None) is not None
+
+    def select(self, table_name, predicate):
+        with self._lock:
+            return [record for record in self.tables[table_name].values() if predicate(record)]
+
+    @staticmethod
+    def public(record, fields=None):
+        values = record['fields']
+        if fields is not None:
+            values = {k: v for k, v in values.items() if k in fields}
+        return {'id': record['id'], 'createdTime': record['createdTime'], 'fields': dict(values)}
+
+
+def seed(base, posts=1000, campaigns=5, influencers=None, seed_value=0):
+    """Fill the base with synthetic campaigns, influencers, posts and error logs"""
+    rnd = random.Random(seed_value)
+    influencers = influencers or max(posts // 2, 10)
+    created = time.time() - 86400
+
+    campaign_values = []
+    for i in range(campaigns):
+        value = str(1000 + i)
+        campaign_values.append(value)
+        base.add('campaignTable', {'CampaignID': value, 'campaignName': f'Campaign {i + 1}'}, created)
+
+    people = []
+    for i in range(influencers):
+        name = f'Surname{i}, Creator'
+        link = f'https://www.tiktok.com/@creator{i}'
+        people.append((name, link))
+        base.add('influencerTable', {
+            'Name': name,
+            'Active': 'YES' if rnd.random() < 0.9 else 'NO',
+            # Some links carry the trailing slash reviewers paste in
+            'TiktokLink': link + ('/' if i % 7 == 0 else ''),
+            'InstagramLink': f'https://www.instagram.com/creator{i}',
+            'ContactNumber': f'27{rnd.randrange(10 ** 8, 10 ** 9)}'
+        }, created)
+
+    for i in range(posts):
+        name, link = people[rnd.randrange(len(people))]
+        quality = rnd.choices(QUALITIES, QUALITY_WEIGHTS)[0]
+        post_id = f'P{i:06d}'
+        base.add('postTable', {
+            'PostID': post_id,
+            'CampaignId': rnd.choice(campaign_values),
+            'TikTokLink': link,
+            'PostLink': f'{link}/video/{7000000000000000000 + i}',
+            'PostQuality': quality,
+            'InfluencerName': name,
+            # Transcriptions dominate record size, as they do in production
+            'VideoTranscription': ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(100, 300))),
+            'ManualFlag': 'Video Ok' if rnd.random() < 0.1 else None
+        }, created)
+        if quality == 'Partially Correct/Incorrect':
+            base.add('contentErrorLogTable', {
+                'postId': [post_id],
+                'errorDescription': rnd.choice(ERROR_DESCRIPTIONS)
+            }, created)
+    return base
+
+
+# --- HTTP ---
+class FakeAirtableServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, base, latency=0.0, jitter=0.0, rate_limit=None, retry_after=None):
+        super().__init__(address, FakeAirtableHandler)
+        self.base = base
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self._window = []
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = {'requests': 0, 'throttled': 0, 'errors': 0, 'bytes_in': 0, 'bytes_out': 0,
+                          'records_out': 0, 'tables': defaultdict(lambda: defaultdict(int))}
+
+    def count(self, table_name, **counters):
+        with self._stats_lock:
+            for counter, value in counters.items():
+                self.stats[counter] += value
+                self.stats['tables'][table_name][counter] += value
+
+    def snapshot(self):
+        with self._stats_lock:
+            return {**self.stats, 'tables': {name: dict(c) for name, c in self.stats['tables'].items()}}
+
+    def throttled(self):
+        """True if this request goes over the per-second budget"""
+        if not self.rate_limit:
+            return False
+        with self._stats_lock:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.rate_limit:
+                return True
+            self._window.append(now)
+            return False
+
+
+class FakeAirtableHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, table_name='-', records=0, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        # Count before writing so a stats call right after the response sees it
+        if not self.path.startswith('/__bench'):
+            self.server.count(table_name, bytes_out=len(body), records_out=records,
+                              errors=int(status >= 400 and status != 429))
+        self.wfile.write(body)
+
+    def _error(self, status, error_type, message, table_name='-'):
+        self._send(status, {'error': {'type': error_type, 'message': message}}, table_name)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        return raw, (json.loads(raw) if raw else {})
+
+    def _route(self):
+        """(table name, record ID or None) for /v0/<base>/<table>[/<record>]"""
+        parts = unquote(urlparse(self.path).path).strip('/').split('/')
+        if len(parts) < 3 or parts[0] != 'v0' or parts[2] not in SCHEMAS:
+            return None, None
+        return parts[2], parts[3] if len(parts) > 3 else None
+
+    def _handle(self, method):
+        if self.path.startswith('/__bench/'):
+            return self._bench(method)
+        raw, body = self._body()
+        table_name, record_id = self._route()
+        self.server.count(table_name or '-', requests=1, bytes_in=len(raw))
+
+        if self.server.latency or self.server.jitter:
+            time.sleep(self.server.latency + random.uniform(0, self.server.jitter))
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._error(401, 'AUTHENTICATION_REQUIRED', 'Authentication required')
+        if table_name is None:
+            return self._error(404, 'NOT_FOUND', 'Could not find table')
+        if self.server.throttled():
+            self.server.count(table_name, throttled=1)
+            headers = {'Retry-After': str(self.server.retry_after)} if self.server.retry_after else None
+            return self._send(429, {'errors': [{'error': 'RATE_LIMIT_REACHED',
+                                                'message': 'Rate limit exceeded. Please try again later'}]},
+                              table_name, headers=headers)
+
+        try:
+            if method == 'GET':
+                return self._read(table_name, record_id)
+            if method in ('PATCH', 'PUT'):
+                return self._write(table_name, record_id, body, replace=method == 'PUT')
+            if method == 'POST':
+                return self._create(table_name, body)
+            if method == 'DELETE':
+                return self._delete(table_name, record_id)
+        except FormulaError as e:
+            return self._error(422, 'INVALID_FILTER_BY_FORMULA', str(e), table_name)
+        except (KeyError, TypeError, ValueError) as e:
+            return self._error(422, 'INVALID_REQUEST_UNKNOWN', str(e), table_name)
+        self._error(405, 'METHOD_NOT_ALLOWED', method, table_name)
+
+    def _unknown_fields(self, table_name, names):
+        unknown = [name for name in names if name not in SCHEMAS[table_name]]
+        if unknown:
+            self._error(422, 'UNKNOWN_FIELD_NAME', f'Unknown field name: "{unknown[0]}"', table_name)
+            return True
+        return False
+
+    def _read(self, table_name, record_id):
+        base = self.server.base
+        if record_id:
+            record = base.tables[table_name].get(record_id)
+            if record is None:
+                return self._error(404, 'NOT_FOUND', 'Could not find record', table_name)
+            return self._send(200, base.public(record), table_name, records=1)
+
+        params = parse_qs(urlparse(self.path).query)
+        fields = params.get('fields[]')
+        if fields and self._unknown_fields(table_name, fields):
+            return
+        page_size = int(params.get('pageSize', [PAGE_SIZE])[0])
+        if not 0 < page_size <= PAGE_SIZE:
+            return self._error(422, 'INVALID_PAGE_SIZE', f'pageSize must be 1-{PAGE_SIZE}', table_name)
+        max_records = int(params.get('maxRecords', [0])[0]) or None
+        start = int(params.get('offset', ['itr0'])[0][3:] or 0)
+
+        matches = base.select(table_name, compile_formula(params.get('filterByFormula', [''])[0]))
+        if max_records:
+            matches = matches[:max_records]
+        page = matches[start:start + page_size]
+        payload = {'records': [base.public(record, fields) for record in page]}
+        if start + page_size < len(matches):
+            # Offsets are opaque to clients; ours is just the next position
+            payload['offset'] = f'itr{start + page_size}'
+        self._send(200, payload, table_name, records=len(page))
+
+    def _write(self, table_name, record_id, body, replace=False):
+        base = self.server.base
+        if record_id:
+            items = [{'id': record_id, 'fields': body['fields']}]
+        else:
+            items = body['records']
+            if len(items) > MAX_RECORDS_PER_WRITE:
+                return self._error(422, 'INVALID_RECORDS', f'At most {MAX_RECORDS_PER_WRITE} records per request', table_name)
+        for item in items:
+            if self._unknown_fields(table_name, item['fields']):
+                return
+        updated = []
+        for item in items:
+            record = base.update(table_name, item['id'], item['fields'], replace)
+            if record is None:
+                return self._error(404, 'NOT_FOUND', f'Could not find record {item["id"]}', table_name)
+            updated.append(record)
+        payload = updated[0] if record_id else {'records': updated}
+        self._send(200, payload, table_name, records=len(updated))
+
+    def _create(self, table_name, body):
+        base = self.server.base
+        items = body['records'] if 'records' in body else [body]
+        if len(items) > MAX_RECORDS_PER_WRITE:
+            return self._error(422, 'INVALID_RECORDS', f'At most {MAX_RECORDS_PER_WRITE} records per request', table_name)
+        for item in items:
+            if self._unknown_fields(table_name, item['fields']):
+                return
+        created = [base.add(table_name, item['fields']) for item in items]
+        payload = {'records': created} if 'records' in body else created[0]
+        self._send(200, payload, table_name, records=len(created))
+
+    def _delete(self, table_name, record_id):
+        base = self.server.base
+        ids = [record_id] if record_id else parse_qs(urlparse(self.path).query).get('records[]', [])
+        deleted = [{'id': rid, 'deleted': True} for rid in ids if base.delete(table_name, rid)]
+        if record_id and not deleted:
+            return self._error(404, 'NOT_FOUND', 'Could not find record', table_name)
+        self._send(200, deleted[0] if record_id else {'records': deleted}, table_name)
+
+    def _bench(self, method):
+        self._body()
+        if method == 'GET' and self.path.startswith('/__bench/stats'):
+            return self._send(200, self.server.snapshot())
+        if method == 'POST' and self.path.startswith('/__bench/reset'):
+            self.server.reset_stats()
+            return self._send(200, {'status': 'reset'})
+        self._send(404, {'error': 'unknown bench endpoint'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+def start_server(base, host='127.0.0.1', port=0, **options):
+    """Serve the base on a background thread; returns the server (see server_address)"""
+    server = FakeAirtableServer((host, port), base, **options)
+    threading.Thread(target=server.serve_forever, name='fake-airtable', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--campaigns', type=int, default=5)
+    parser.add_argument('--influencers', type=int, default=None, help='default: half the post count')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many extra seconds per request')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second before 429s')
+    parser.add_argument('--retry-after', type=int, default=None, help='Retry-After seconds sent with 429s')
+    args = parser.parse_args()
+
+    base = seed(FakeBase(), args.posts, args.campaigns, args.influencers, args.seed)
+    server = FakeAirtableServer((args.host, args.port), base, latency=args.latency, jitter=args.jitter,
+                                rate_limit=args.rate_limit, retry_after=args.retry_after)
+    host, port = server.server_address[:2]
+    print(f'Fake Airtable on http://{host}:{port}/v0 '
+          f'({sum(len(t) for t in base.tables.values())} records)', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""Benchmark the review pipeline against bench/fake_airtable.py.
+
+Each case runs in a fresh app process (after warm-up) so the first run
+starts with cold caches; later runs show the warm path. Reported per case:
+wall time, Airtable requests, 429s and bytes the fake server sent.
+
+    python bench/run.py --posts 10000 --latency 0.1
+    python bench/run.py --save bench/baseline.json
+    python bench/run.py --compare bench/baseline.json   # exit 1 on regression
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+BASE_ID = 'appBench'
+API_KEY = 'keyBench'
+
+# name -> GET path ({cid} is a campaign record ID) or app function called with a snapshot
+CASES = {
+    'summary_endpoint': '/get_summary_data?campaign_id={cid}',
+    'review_combined': '/get_review_data?type=combined&campaign_id={cid}',
+    'review_issues': '/get_review_data?type=issues&campaign_id={cid}',
+    'review_not_uploaded': '/get_review_data?type=not_uploaded&campaign_id={cid}',
+    'review_manual_review': '/get_review_data?type=manual_review&campaign_id={cid}',
+    'campaign_select': '/campaign_select',
+    'compute_summary_data': ('compute_summary_data', ('summary',)),
+    'get_all_posts_combined': ('get_all_posts_combined', ('issues', 'without_issues')),
+    'process_not_uploaded_review': ('process_not_uploaded_review', ('not_uploaded',))
+}
+
+# Allowed slowdown against a baseline before a case counts as a regression;
+# requests and bytes are deterministic for a given seed and must not grow
+DEFAULT_TIME_TOLERANCE = 0.25
+
+
+def _fake(api_url, path, method='GET', attempts=10):
+    """JSON from the fake server, waiting out 429s (Retry-After, else backoff)"""
+    root = api_url.rsplit('/v0', 1)[0]
+    req = urllib.request.Request(root + path, method=method,
+                                 headers={'Authorization': f'Bearer {API_KEY}'})
+    for attempt in range(attempts):
+        try:
+            with urllib.request.urlopen(req) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code != 429 or attempt == attempts - 1:
+                raise
+            time.sleep(float(e.headers.get('Retry-After') or 0.25 * 2 ** attempt))
+
+
+def run_case(name, repeat, api_url):
+    """Child process: time one case against the fake server, print JSON runs"""
+    sys.path.insert(0, REPO_DIR)
+    import app
+
+    deadline = time.time() + 120
+    while app.warmup_status['state'] in ('pending', 'running') and time.time() < deadline:
+        time.sleep(0.05)
+    campaign_id = _fake(api_url, f'/v0/{BASE_ID}/campaignTable?maxRecords=1')['records'][0]['id']
+    client = app.app.test_client()
+    case = CASES[name]
+
+    runs = []
+    for _ in range(repeat):
+        _fake(api_url, '/__bench/reset', 'POST')
+        started = time.perf_counter()
+        if isinstance(case, str):
+            response = client.get(case.format(cid=campaign_id))
+            status, size = response.status_code, len(response.get_data())
+        else:
+            function, views = case
+            with app.app.test_request_context():
+                result = getattr(app, function)(app.CampaignSnapshot(campaign_id, views=views))
+            status, size = 200, len(json.dumps(result))
+        elapsed = time.perf_counter() - started
+        stats = _fake(api_url, '/__bench/stats')
+        runs.append({'seconds': elapsed, 'status': status, 'response_bytes': size,
+                     'requests': stats['requests'], 'throttled': stats['throttled'],
+                     'bytes': stats['bytes_out'], 'records': stats['records_out']})
+    print(json.dumps(runs))
+
+
+def start_fake(args):
+    command = [sys.executable, os.path.join(BENCH_DIR, 'fake_airtable.py'), '--port', '0',
+               '--posts', str(args.posts), '--campaigns', str(args.campaigns),
+               '--seed', str(args.seed), '--latency', str(args.latency)]
+    if args.influencers:
+        command += ['--influencers', str(args.influencers)]
+    if args.rate_limit:
+        command += ['--rate-limit', str(args.rate_limit)]
+    fake = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    banner = fake.stdout.readline()
+    return fake, banner.split()[3]
+
+
+def summarize(runs):
+    first, rest = runs[0], runs[1:] or runs[:1]
+    return {
+        'status': first['status'],
+        'first_seconds': round(first['seconds'], 4),
+        'warm_seconds': round(statistics.median(r['seconds'] for r in rest), 4),
+        'first_requests': first['requests'],
+        'warm_requests': max(r['requests'] for r in rest),
+        'first_bytes': first['bytes'],
+        'warm_bytes': max(r['bytes'] for r in rest),
+        'throttled': sum(r['throttled'] for r in runs),
+        'response_bytes': first['response_bytes']
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing every metric that got worse than the baseline"""
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get('cases', {}).get(name)
+        if not before:
+            continue
+        for metric in ('first_requests', 'warm_requests', 'first_bytes', 'warm_bytes'):
+            if current[metric] > before[metric]:
+                regressions.append(f'{name}: {metric} {before[metric]} -> {current[metric]}')
+        for metric in ('first_seconds', 'warm_seconds'):
+            if current[metric] > before[metric] * (1 + tolerance) and current[metric] - before[metric] > 0.01:
+                regressions.append(f'{name}: {metric} {before[metric]:.4f} -> {current[metric]:.4f}')
+    return regressions
+
+
+def print_table(results):
+    header = f'{"case":<28} {"status":>6} {"first s":>9} {"warm s":>9} {"calls":>11} {"KB from Airtable":>18} {"429s":>5}'
+    print(header)
+    print('-' * len(header))
+    for name, r in results.items():
+        calls = f'{r["first_requests"]}/{r["warm_requests"]}'
+        kb = f'{r["first_bytes"] / 1024:.1f}/{r["warm_bytes"] / 1024:.1f}'
+        print(f'{name:<28} {r["status"]:>6} {r["first_seconds"]:>9.4f} {r["warm_seconds"]:>9.4f} '
+              f'{calls:>11} {kb:>18} {r["throttled"]:>5}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--campaigns', type=int, default=5)
+    parser.add_argument('--influencers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the fake adds to every request')
+    parser.add_argument('--rate-limit', type=float, default=None, help='fake 429s above this many requests/s')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case; the first is cold')
+    parser.add_argument('--cases', nargs='*', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--save', help='write results as JSON to this path')
+    parser.add_argument('--compare', help='baseline JSON from --save; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    parser.add_argument('--api-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        return run_case(args.case, args.repeat, args.api_url)
+
+    fake, api_url = start_fake(args)
+    env = dict(os.environ, AIRTABLE_API_KEY=API_KEY, AIRTABLE_BASE_ID=BASE_ID, AIRTABLE_API_URL=api_url)
+    for name in ('AIRTABLE_MIRROR_PATH', 'APP_STATE_PATH'):
+        env.pop(name, None)
+    results = {}
+    try:
+        for name in args.cases:
+            child = subprocess.run(
+                [sys.executable, __file__, '--case', name, '--repeat', str(args.repeat), '--api-url', api_url],
+                env=env, capture_output=True, text=True, check=True)
+            results[name] = summarize(json.loads(child.stdout.strip().splitlines()[-1]))
+    finally:
+        fake.terminate()
+        fake.wait()
+
+    print_table(results)
+    report = {'config': {k: getattr(args, k) for k in ('posts', 'campaigns', 'influencers', 'seed',
+                                                        'latency', 'rate_limit', 'repeat')},
+              'cases': results}
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('config') != report['config']:
+            print('warning: baseline was recorded with a different configuration')
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,13 +17,18 @@ document.addEventListener('DOMContentLoaded', () => {
         },
         currentReviewType: '',
         isLoading: false,
+        loadingMore: false,
+        reviewStream: null,
     };
 
     // --- Global Variables ---
     let autoRefreshInterval;
     let currentRatingValue = 0;
+    let summaryEtag = null;
     const currentCampaignId = document.getElementById('campaign-id') ?
         document.getElementById('campaign-id').value : '';
+    const liveEvents = document.getElementById('live-events') ?
+        document.getElementById('live-events').value === 'on' : false;
 
     // --- DOM Elements ---
     const messageBox = document.getElementById('message-box'),
@@ -73,59 +78,38 @@ document.addEventListener('DOMContentLoaded', () => {
     return data[index] || null;
 }
 
-function getFirstName(fullName) {
-    if (!fullName) return "Unknown";
-    if (fullName.includes(',')) {
-        return fullName.split(',')[0].trim() || fullName.split(',')[1].trim();
+async function loadMessage(currentItem, flag) {
+    if (!currentItem) return "";
+    if (currentItem.suggestedMessage !== undefined && !flag) return currentItem.suggestedMessage;
+    if (!currentItem.messageScenario) return "";
+
+    currentItem.messages = currentItem.messages || {};
+    const key = flag || currentItem.messageScenario;
+    if (currentItem.messages[key] === undefined) {
+        // Only flag messages quote the post link; review messages say "your post"
+        const fields = flag
+            ? Object.assign({}, currentItem.messageFields, { post_link: currentItem.videoLink })
+            : currentItem.messageFields;
+        const response = await fetch('/suggested_message', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ scenario: currentItem.messageScenario, flag: flag || null, fields })
+        });
+        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+        currentItem.messages[key] = (await response.json()).message;
     }
-    return fullName.split(' ')[0].trim();
+    return currentItem.messages[key];
 }
 
-function generateMessage(currentItem, flag) {
-    if (!currentItem) return "";
-
-    const firstName = getFirstName(currentItem.influencerName);
-    const campaignName = currentItem.campaignName || 'the campaign';
-    const postLink = currentItem.videoLink || 'your post';
-
-    let messageLines = [];
-
-    if (flag === 'Video Ok') {
-        messageLines = [
-            `Hi ${firstName},`,
-            `We are confirming that your recent post for ${campaignName} is approved:`,
-            `View it here: <a href="${postLink}">Link</a>`,
-            // `It can remain online.`,
-            `Thanks!`
-        ];
-    } else if (flag === 'Take Down Video') {
-        messageLines = [
-            `Hi ${firstName},`,
-            `We are issuing a takedown notice for your recent post for ${campaignName}:`,
-            `Reason: ${currentItem.issueCaption || 'Content policy violation'}`,
-            `View it here: ${postLink}`,
-            `Please take it down promptly.`,
-            `Thanks!`
-        ];
-    } else if (currentItem?.hasIssues) {
-        messageLines = [
-            `Hi ${firstName},`,
-            `We noticed issues with your recent post for ${campaignName}:`,
-            currentItem.issueCaption || 'Please review your post',
-            `View it here: ${postLink}`,
-            `Please review and update.`,
-            `Thanks!`
-        ];
-    } else {
-        messageLines = [
-            `Hi ${firstName},`,
-            `Great job on your recent post for ${campaignName}!`,
-            `Your content looks perfect and meets all requirements.`,
-            `Thank you for your excellent work!`,
-            `Keep it up!`
-        ];
-    }
-    return messageLines.join('\n');
+function showSuggestedMessage(currentItem, flag) {
+    if (!suggestedMessageElem) return;
+    suggestedMessageElem.value = '';
+    loadMessage(currentItem, flag)
+        .then(message => {
+            // Skip if the reviewer has moved on while the message loaded
+            if (getCurrentItem() === currentItem) suggestedMessageElem.value = message;
+        })
+        .catch(error => console.error('Error loading suggested message:', error));
 }
 
     const showMessage = (msg, type = 'success') => {
@@ -192,6 +176,14 @@ function generateMessage(currentItem, flag) {
         }
     }
 
+    const renderSummaryData = (data) => {
+        if (totalInfluencersElem) totalInfluencersElem.textContent = data.number_of_influencers || 0;
+        if (videosApprovedElem) videosApprovedElem.textContent = data.videos_with_no_issues || 0;
+        if (videosIssuesElem) videosIssuesElem.textContent = data.videos_with_issues || 0;
+        if (videosNotUploadedElem) videosNotUploadedElem.textContent = data.videos_not_loaded_yet || 0;
+        if (videosManualReviewElem) videosManualReviewElem.textContent = data.videos_for_manual_review || 0;
+    };
+
     // Fetch summary data
     const fetchSummaryData = async () => {
         try {
@@ -200,22 +192,22 @@ function generateMessage(currentItem, flag) {
                 url += `?campaign_id=${encodeURIComponent(currentCampaignId)}`;
             }
 
-            const response = await fetch(url);
+            // Revalidate against the last summary; 304 means nothing changed
+            const headers = summaryEtag ? { 'If-None-Match': summaryEtag } : {};
+            const response = await fetch(url, { headers, cache: 'no-store' });
+            if (response.status === 304) return;
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
             const data = await response.json();
-
-            if (totalInfluencersElem) totalInfluencersElem.textContent = data.number_of_influencers || 0;
-            if (videosApprovedElem) videosApprovedElem.textContent = data.videos_with_no_issues || 0;
-            if (videosIssuesElem) videosIssuesElem.textContent = data.videos_with_issues || 0;
-            if (videosNotUploadedElem) videosNotUploadedElem.textContent = data.videos_not_loaded_yet || 0;
-            if (videosManualReviewElem) videosManualReviewElem.textContent = data.videos_for_manual_review || 0;
+            summaryEtag = response.headers.get('ETag');
+            renderSummaryData(data);
 
         } catch (error) {
             console.error('Error fetching summary data:', error);
             showMessage('Error loading summary data: ' + error.message, 'error');
+            summaryEtag = null;
             const errorText = '--';
             if (totalInfluencersElem) totalInfluencersElem.textContent = errorText;
             if (videosApprovedElem) videosApprovedElem.textContent = errorText;
@@ -240,27 +232,121 @@ function generateMessage(currentItem, flag) {
         try {
             const response = await fetch('/audit_status');
             const data = await response.json();
-            if (activeAuditIndicator) {
-                if (data.active_audits.includes(currentCampaignId)) {
-                    activeAuditIndicator.classList.remove('hidden');
-                } else {
-                    activeAuditIndicator.classList.add('hidden');
-                }
-            }
+            showAuditStatus(data.active_audits.includes(currentCampaignId));
         } catch (error) {
             console.error('Error checking audit status:', error);
         }
     }
 
-    // Fetch review data
+    function showAuditStatus(active) {
+        if (activeAuditIndicator) {
+            if (active) {
+                activeAuditIndicator.classList.remove('hidden');
+            } else {
+                activeAuditIndicator.classList.add('hidden');
+            }
+        }
+    }
+
+    function stopAutoRefresh() {
+        if (autoRefreshInterval) clearInterval(autoRefreshInterval);
+        autoRefreshInterval = null;
+    }
+
+    // Live updates over server-sent events; polls only while disconnected
+    function connectEvents() {
+        if (!liveEvents || !window.EventSource) {
+            startAutoRefresh();
+            return;
+        }
+        const events = new EventSource(`/events?campaign_id=${encodeURIComponent(currentCampaignId)}`);
+        events.addEventListener('open', stopAutoRefresh);
+        events.addEventListener('error', () => {
+            // EventSource retries by itself; poll until it reconnects
+            if (!autoRefreshInterval) startAutoRefresh();
+        });
+        events.addEventListener('summary', (e) => {
+            summaryEtag = null;
+            renderSummaryData(JSON.parse(e.data));
+        });
+        events.addEventListener('audit', (e) => {
+            showAuditStatus(JSON.parse(e.data).active);
+        });
+    }
+
+    // Read an NDJSON response line by line, calling onItem for each parsed object
+async function readNdjson(response, onItem) {
+    if (!response.body || !response.body.getReader) {
+        // No streaming support: parse the whole body at once
+        const text = await response.text();
+        text.split('\n').filter(line => line.trim()).forEach(line => onItem(JSON.parse(line)));
+        return;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => onItem(JSON.parse(line)));
+        if (done) break;
+    }
+    if (buffer.trim()) onItem(JSON.parse(buffer));
+}
+
+    // On slow or data-saver connections fetch the whole list in one compact
+    // response instead of streaming it item by item
+const preferCompactPayload = () => {
+    const connection = navigator.connection;
+    return !!connection && (connection.saveData || ['slow-2g', '2g', '3g'].includes(connection.effectiveType));
+};
+
+    // Rebuild items from /get_review_data?format=compact (pack_review_items in app.py)
+const unpackReviewItems = ({ shared, columns, rows }) => rows.map((row) => {
+    const item = {};
+    const set = (key, value) => {
+        const dot = key.indexOf('.');
+        if (dot === -1) {
+            item[key] = value;
+            return;
+        }
+        const parent = key.slice(0, dot);
+        item[parent] = item[parent] || {};
+        item[parent][key.slice(dot + 1)] = value;
+    };
+    Object.entries(shared).forEach(([key, value]) => set(key, value));
+    columns.forEach((key, i) => set(key, row[i]));
+    return item;
+});
+
+    // Fetch review data: the first item is shown as soon as it arrives,
+    // the rest stream in behind it
 const fetchReviewData = async (reviewType) => {
     if (state.isLoading) return;
     setLoading(true);
 
+    // Stop any stream still filling in a previous list
+    if (state.reviewStream) state.reviewStream.abort();
+    const controller = new AbortController();
+    state.reviewStream = controller;
+
+    let items = null;
+    const showFirstItem = () => {
+        state.data[reviewType] = items;
+        state.currentIndex[reviewType] = 0;
+        state.currentReviewType = reviewType;
+        setLoading(false);
+        renderReviewView(reviewType);
+    };
+
     try {
         // Encode parameters to handle special characters
-        const url = `/get_review_data?type=${encodeURIComponent(reviewType)}&campaign_id=${encodeURIComponent(currentCampaignId)}`;
-        const response = await fetch(url);
+        const compact = preferCompactPayload();
+        const url = `/get_review_data?type=${encodeURIComponent(reviewType)}&campaign_id=${encodeURIComponent(currentCampaignId)}&format=${compact ? 'compact' : 'ndjson'}`;
+        const response = await fetch(url, { signal: controller.signal });
 
         if (!response.ok) {
             // Try to get error details from response
@@ -276,19 +362,84 @@ const fetchReviewData = async (reviewType) => {
             throw new Error(errorMsg);
         }
 
-        const data = await response.json();
-        state.data[reviewType] = data;
-        state.currentIndex[reviewType] = 0;
-        state.currentReviewType = reviewType;
+        if (compact) {
+            items = unpackReviewItems(await response.json());
+            showFirstItem();
+            return;
+        }
 
-        setLoading(false);
-        renderReviewView(reviewType);
+        state.loadingMore = true;
+        await readNdjson(response, (item) => {
+            if (item.error) {
+                showMessage(`Some items failed to load: ${item.error}`, 'error');
+                return;
+            }
+            if (items === null) {
+                items = [item];
+                showFirstItem();
+            } else {
+                items.push(item);
+                if (state.currentReviewType === reviewType) updateReviewNavigation(reviewType);
+            }
+        });
+
+        state.loadingMore = false;
+        if (items === null) {
+            // Nothing to review
+            items = [];
+            showFirstItem();
+        } else if (state.currentReviewType === reviewType) {
+            updateReviewNavigation(reviewType);
+        }
 
     } catch (error) {
+        if (error.name === 'AbortError') return;
+        state.loadingMore = false;
         console.error(`Failed to fetch data for ${reviewType}:`, error);
         showMessage(`Failed to load data: ${error.message}`, 'error');
-        setLoading(false);
-        switchView('summary-view');
+        if (items === null) {
+            setLoading(false);
+            switchView('summary-view');
+        } else if (state.currentReviewType === reviewType) {
+            updateReviewNavigation(reviewType);
+        }
+    } finally {
+        if (state.reviewStream === controller) state.reviewStream = null;
+    }
+};
+
+// Counter and prev/next buttons; re-run as more items stream in
+const updateReviewNavigation = (reviewType) => {
+    const data = state.data[reviewType] || [];
+    const index = state.currentIndex[reviewType] || 0;
+    if (!data.length) return;
+
+    if (issuesCounter) {
+        const more = state.loadingMore ? ' (loading more...)' : '';
+        issuesCounter.textContent = `${getReviewTypeName(reviewType)} ${index + 1} of ${data.length}${more}`;
+    }
+
+    // Enable/disable navigation buttons
+    if (prevBtn && nextBtn) {
+        prevBtn.disabled = (index <= 0);
+        nextBtn.disabled = (index >= data.length - 1);
+
+        prevBtn.classList.toggle('bg-gray-400', prevBtn.disabled);
+        prevBtn.classList.toggle('cursor-not-allowed', prevBtn.disabled);
+        prevBtn.classList.toggle('bg-gray-600', !prevBtn.disabled);
+        prevBtn.classList.toggle('hover:bg-gray-700', !prevBtn.disabled);
+
+        nextBtn.classList.toggle('bg-gray-400', nextBtn.disabled);
+        nextBtn.classList.toggle('cursor-not-allowed', nextBtn.disabled);
+        nextBtn.classList.toggle('bg-blue-600', !nextBtn.disabled);
+        nextBtn.classList.toggle('hover:bg-blue-700', !nextBtn.disabled);
+
+        // Change text for last post
+        if (index >= data.length - 1 && !state.loadingMore) {
+            nextBtn.textContent = 'Finished';
+        } else {
+            nextBtn.textContent = 'Next Post →';
+        }
     }
 };
 
@@ -334,7 +485,6 @@ const renderReviewView = (reviewType) => {
 
     // Set heading
     if (reviewHeading) reviewHeading.textContent = getReviewTypeName(reviewType);
-    if (issuesCounter) issuesCounter.textContent = `${getReviewTypeName(reviewType)} ${index + 1} of ${data.length}`;
 
     // Reset all containers
     if (videoLinkContainer) videoLinkContainer.classList.add('hidden');
@@ -363,7 +513,7 @@ const renderReviewView = (reviewType) => {
         }
 
         if (messageContainer) messageContainer.classList.remove('hidden');
-        if (suggestedMessageElem) suggestedMessageElem.value = currentItem.suggestedMessage || '';
+        showSuggestedMessage(currentItem);
 
         if (actionBtn) {
             actionBtn.textContent = 'Send Message';
@@ -437,7 +587,7 @@ const renderReviewView = (reviewType) => {
         }
 
         if (messageContainer) messageContainer.classList.remove('hidden');
-        if (suggestedMessageElem) suggestedMessageElem.value = currentItem.suggestedMessage || '';
+        showSuggestedMessage(currentItem);
 
         // Set button text based on post type
         if (actionBtn) {
@@ -476,28 +626,7 @@ const renderReviewView = (reviewType) => {
         }
     }
 
-    // Enable/disable navigation buttons
-    if (prevBtn && nextBtn) {
-        prevBtn.disabled = (index <= 0);
-        nextBtn.disabled = (index >= data.length - 1);
-
-        prevBtn.classList.toggle('bg-gray-400', prevBtn.disabled);
-        prevBtn.classList.toggle('cursor-not-allowed', prevBtn.disabled);
-        prevBtn.classList.toggle('bg-gray-600', !prevBtn.disabled);
-        prevBtn.classList.toggle('hover:bg-gray-700', !prevBtn.disabled);
-
-        nextBtn.classList.toggle('bg-gray-400', nextBtn.disabled);
-        nextBtn.classList.toggle('cursor-not-allowed', nextBtn.disabled);
-        nextBtn.classList.toggle('bg-blue-600', !nextBtn.disabled);
-        nextBtn.classList.toggle('hover:bg-blue-700', !nextBtn.disabled);
-
-        // Change text for last post
-        if (index >= data.length - 1) {
-            nextBtn.textContent = 'Finished';
-        } else {
-            nextBtn.textContent = 'Next Post →';
-        }
-    }
+    updateReviewNavigation(reviewType);
 
     // Combine save and next functionality
     if (actionBtn && (reviewType === 'issues' || reviewType === 'combined')) {
@@ -530,6 +659,21 @@ const renderReviewView = (reviewType) => {
         }
     }
 
+// Send review edits through the batched write endpoint
+async function saveUpdates(updates) {
+    const response = await fetch('/batch_update', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ updates: updates })
+    });
+    const data = await response.json();
+    if (!response.ok || data.status !== 'success') {
+        const failed = (data.results || []).find(r => r.status !== 'success');
+        throw new Error((failed && failed.message) || data.message || data.error || `status ${response.status}`);
+    }
+    return data.results;
+}
+
 async function handleSaveChanges() {
     const reviewType = state.currentReviewType;
     const index = state.currentIndex[reviewType];
@@ -539,41 +683,17 @@ async function handleSaveChanges() {
     if (!currentItem) return;
 
     try {
-        // Save flag if changed
-        if (flagSelect && flagSelect.value !== currentItem.currentFlag) {
-            await fetch('/save_flag', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    postId: currentItem.postId,
-                    flag: flagSelect.value
-                })
-            });
-            currentItem.currentFlag = flagSelect.value;
-        }
+        // Flag, rating and reviewed status go out in a single request
+        const update = { postId: currentItem.postId, reviewed: true };
+        const flagChanged = flagSelect && flagSelect.value && flagSelect.value !== currentItem.currentFlag;
+        const ratingChanged = currentRatingValue > 0 && currentRatingValue !== currentItem.currentRating;
+        if (flagChanged) update.flag = flagSelect.value;
+        if (ratingChanged) update.rating = currentRatingValue;
 
-        // Save rating if changed
-        if (currentRatingValue !== currentItem.currentRating) {
-            await fetch('/save_rating', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    postId: currentItem.postId,
-                    rating: currentRatingValue
-                })
-            });
-            currentItem.currentRating = currentRatingValue;
-        }
+        await saveUpdates([update]);
 
-        // Mark as reviewed
-        await fetch('/mark_reviewed', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                postId: currentItem.postId,
-                reviewed: true
-            })
-        });
+        if (flagChanged) currentItem.currentFlag = flagSelect.value;
+        if (ratingChanged) currentItem.currentRating = currentRatingValue;
         currentItem.reviewed = true;
 
         // Confirmation for reviewed posts
@@ -707,31 +827,11 @@ if (shouldOpenNew) {
         try {
             setLoading(true);
 
-            // Save comment if provided
-            if (comment.trim()) {
-                const commentPayload = {
-                    postId: currentItem.postId,
-                    comment: comment
-                };
-                await fetch('/save_comment', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(commentPayload)
-                });
-            }
-
-            // Save rating if provided
-            if (rating > 0) {
-                const ratingPayload = {
-                    postId: currentItem.postId,
-                    rating: rating
-                };
-                await fetch('/save_rating', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(ratingPayload)
-                });
-            }
+            // Save comment and rating together
+            const update = { postId: currentItem.postId };
+            if (comment.trim()) update.comment = comment;
+            if (rating > 0) update.rating = rating;
+            await saveUpdates([update]);
 
             setLoading(false);
             showMessage('Post reviewed. Moving to next.', 'success');
@@ -902,8 +1002,8 @@ if (flagSelect) {
         const data = state.data[reviewType] || [];
         const currentItem = (index >= 0 && index < data.length) ? data[index] : null;
 
-        if (currentItem && suggestedMessageElem) {
-            suggestedMessageElem.value = generateMessage(currentItem, this.value);
+        if (currentItem) {
+            showSuggestedMessage(currentItem, this.value);
         }
     });
 }
@@ -928,9 +1028,9 @@ if (flagSelect) {
     switchView('summary-view');
     fetchSummaryData();
 
-    // Start auto-refresh if campaign is selected
+    // Start live updates if campaign is selected
     if (currentCampaignId) {
-        startAutoRefresh();
+        connectEvents();
         checkAuditStatus();
     }
 });